@@ -0,0 +1,73 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGGER = os.path.join(SCRIPT_DIR, "bitaxe_status_logger.py")
+
+def time_command(command, runs):
+    """
+    Run a command repeatedly and return the wall-clock times in milliseconds.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=SCRIPT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def main():
+    """
+    Measure cold-start time of the status logger's one-shot paths against a bare interpreter.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark bitaxe_status_logger.py startup time")
+    parser.add_argument("--runs", type=int, default=20, help="Number of runs per command (default: 20)")
+    parser.add_argument("--values", type=str, default="values.csv", help="Values CSV file for validate-values (default: values.csv)")
+    args = parser.parse_args()
+
+    commands = [
+        ("python (no script)", [sys.executable, "-c", "pass"]),
+        ("import only", [sys.executable, "-c", "import bitaxe_status_logger"]),
+        ("--help", [sys.executable, LOGGER, "--help"]),
+        ("validate-values", [sys.executable, LOGGER, "validate-values", args.values]),
+    ]
+    baseline = None
+    print(f"{'Command':<22}{'Min (ms)':>10}{'Median (ms)':>13}{'Over python (ms)':>18}")
+    for label, command in commands:
+        timings = time_command(command, args.runs)
+        median = statistics.median(timings)
+        if baseline is None:
+            baseline = median
+        print(f"{label:<22}{min(timings):>10.1f}{median:>13.1f}{median - baseline:>18.1f}")
+
+    # Per-module breakdown of the script's own imports, largest first. -X importtime lists each
+    # module after the modules it imported, indented one level deeper, so the script's direct
+    # imports are the lines just above it at the next indentation level.
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import bitaxe_status_logger"],
+                            cwd=SCRIPT_DIR, capture_output=True, text=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            name = parts[2].rstrip()
+            entries.append((int(parts[1]), name.strip(), len(name) - len(name.lstrip())))
+    rows = []
+    for index, (cumulative, module, indent) in enumerate(entries):
+        if module != "bitaxe_status_logger":
+            continue
+        rows.append((cumulative, module))
+        for child_cumulative, child, child_indent in reversed(entries[:index]):
+            if child_indent <= indent:
+                break
+            if child_indent == indent + 2:
+                rows.append((child_cumulative, child))
+        break
+    print("\nLargest cumulative imports of bitaxe_status_logger (us):")
+    for cumulative, module in sorted(rows, reverse=True)[:10]:
+        print(f"{cumulative:>10}  {module}")
+
+if __name__ == "__main__":
+    main()
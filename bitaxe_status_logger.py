@@ -1,4 +1,3 @@
-import requests
 import time
 import signal
 import sys
@@ -7,6 +6,14 @@ import re
 from datetime import datetime
 import os
 import csv
+import math
+import json
+import random
+import shutil
+import ipaddress
+import tempfile
+# requests (and http.client/asyncio for the one-shot commands) are imported inside the functions
+# that use them, so --help and the one-shot subcommands start quickly.
 
 # ANSI Color Codes
 GREEN = "\033[32m"
@@ -32,6 +39,14 @@ CONFIG = {
     # Smaller intervals provide more frequent updates but may increase API call frequency.
     "status_interval": 10,
 
+    # Longest wait in seconds for new settings to show up in /api/system/info after a change (default: 30s).
+    # The Bitaxe is polled every apply_poll_interval seconds until frequency and voltage match;
+    # the elapsed time is journalled as the time to verified apply.
+    "apply_timeout": 30,
+
+    # Interval between /api/system/info polls while verifying new settings in seconds (default: 0.5s).
+    "apply_poll_interval": 0.5,
+
     # Warning threshold for chip temperature in °C (default: 65°C).
     # Triggers orange-colored console output when chip temperature exceeds this value.
     # Helps identify potential overheating risks before reaching critical levels.
@@ -88,6 +103,81 @@ CONFIG = {
     # Ensures system stability after a critical event.
     "advance_delay": 7200,
 
+    # Longest wait in seconds for the Bitaxe to cool down after a critical hit in a sweep (default: 1800s = 30 minutes).
+    # The next scheduled run only starts once temperature, VR temperature and power are back under their
+    # warning limits and critical_advance_margin below their critical limits, or once this time has passed.
+    "cooldown_timeout": 1800,
+
+    # Interval between checks of the values CSV file for changes in seconds (default: 30s).
+    # In monitor mode with -values, the file's modification time is polled at this interval and
+    # the voltage-frequency pairs are reloaded in place when it changes, keeping the fallback state.
+    "values_reload_interval": 30,
+
+    # Duration of each exploration trial in monitor mode in seconds (default: 600s = 10 minutes).
+    # With -explore, a neighbouring frequency at the current voltage runs for this long before
+    # its average hashrate is recorded and the ladder frequency is restored.
+    "explore_window": 600,
+
+    # Settling time at the start of each exploration trial in seconds (default: 120s).
+    # Hashrate readings taken during this period are ignored, since the reported hashrate is a moving average.
+    "explore_settle": 120,
+
+    # Interval between exploration trials in monitor mode in seconds (default: 3600s = 60 minutes).
+    # Production runs at the ladder frequency between trials.
+    "explore_interval": 3600,
+
+    # Frequency step size in MHz between exploration candidates (default: 1 MHz).
+    "explore_step": 1,
+
+    # Number of trials a frequency needs before it can be promoted into the ladder (default: 2).
+    # The current ladder frequency needs the same number of trials to serve as the baseline.
+    "explore_min_trials": 2,
+
+    # Minimum hashrate gain in percent over the ladder frequency for promotion (default: 0.5%).
+    # Prevents the ladder from chasing measurement noise.
+    "explore_promote_margin": 0.5,
+
+    # Number of most recent exploration trials per voltage that the bandit remembers (default: 30).
+    # Older trials are forgotten, so the means follow slow changes such as the ambient temperature;
+    # keep it above (2 x explore range / explore_step + 1) x explore_min_trials so promotion stays reachable.
+    "explore_memory": 30,
+
+    # Hysteresis in °C for switching between ambient profiles in monitor mode (default: 2°C).
+    # With -profiles, the ladder only changes when the thermal baseline leaves the active
+    # profile's temperature bucket by more than this amount, preventing rapid flip-flopping.
+    "profile_hysteresis": 2,
+
+    # Number of recent readings averaged into the thermal baseline in monitor mode (default: 6).
+    # With -profiles, each values_reload_interval check re-samples the baseline from the last N chip and
+    # VR temperatures taken at the current settings, so a monitor holding steady still follows the ambient.
+    "baseline_readings": 6,
+
+    # Age in seconds after which a device's state in the fleet directory is ignored (default: 60s).
+    # With -fleet-dir, devices that stop publishing (stopped, crashed, unreachable) drop out of the
+    # fleet power total after this long.
+    "fleet_stale_after": 60,
+
+    # Reserve in watts kept below -power-budget when granting advances (default: 2W).
+    # Absorbs estimation error in the predicted power of the next voltage-frequency pair.
+    "power_budget_margin": 2,
+
+    # Minimum time between dashboard refreshes in seconds (default: 2s).
+    # The dashboard subcommand redraws at most this often and only rewrites cells that changed,
+    # so watching a large fleet stays cheap on CPU and on slow SSH links.
+    "dashboard_refresh": 2,
+
+    # Age in seconds after which a discovery scan is repeated instead of read from the inventory (default: 3600s).
+    # The discover subcommand reuses the inventory file's results for a network scanned more recently than this,
+    # and commands using -inventory warn when the inventory is older.
+    "inventory_ttl": 3600,
+
+    # Maximum number of simultaneous connections during a discovery scan (default: 64).
+    # Keeps a scan of a large network from exhausting file descriptors or flooding the access point.
+    "discover_concurrency": 64,
+
+    # Time in seconds to wait for each address to connect and answer during a discovery scan (default: 2s).
+    "discover_timeout": 2,
+
     # Frequency range in MHz to test above and below the center frequency (default: 10 MHz).
     # Defines the sweep width around the initial or calculated frequency in sweep mode.
     # Ignored in monitor mode. Larger ranges test more frequencies but increase test time.
@@ -104,6 +194,27 @@ CONFIG = {
     "reboot": None,
 }
 
+# CONFIG keys that must be whole numbers, and keys that must be greater than zero,
+# when set from a -config file.
+INTEGER_CONFIG_KEYS = {
+    "min_frequency", "min_core_voltage", "readings_to_advance", "range", "step", "reboot",
+    "explore_step", "explore_min_trials", "discover_concurrency", "baseline_readings", "explore_memory",
+}
+POSITIVE_CONFIG_KEYS = {
+    "run_duration", "log_interval", "status_interval", "apply_timeout", "apply_poll_interval", "min_frequency", "min_core_voltage",
+    "readings_to_advance", "step", "reboot", "values_reload_interval", "explore_window",
+    "explore_interval", "explore_step", "explore_min_trials", "fleet_stale_after", "dashboard_refresh",
+    "inventory_ttl", "discover_concurrency", "discover_timeout", "baseline_readings", "explore_memory",
+}
+
+# Fields every fleet state file must carry, and the CONFIG limits each device publishes in it
+# so that a dashboard colours every device against its own limits.
+FLEET_STATE_NUMBER_KEYS = ("ts", "frequency", "coreVoltage", "hashRate", "power", "temp", "vrTemp", "jth")
+FLEET_LIMIT_KEYS = (
+    "max_temp_warning", "max_temp_critical", "max_vrtemp_warning", "max_vrtemp_critical",
+    "max_power_warning", "max_power_critical",
+)
+
 # Global variables
 system_info = {
     "frequency": None,
@@ -127,21 +238,38 @@ bitaxe_ip = None
 readings_filename = None
 summaries_filename = None
 values_found_filename = None
+journal_filename = None
 best_hashrate = 0.0
 best_frequency = None
 best_voltage = None
 best_hashrates = {}
+point_results = {}
 value_pairs = []
+values_filename = None
+values_mtime = None
 last_fallback_time = None
 last_fallback_voltage = None
+thermal_baseline = None
+recent_temps = []
+profiles = []
+active_profile_index = None
+fleet_dir = None
+power_budget = None
+budget_policy = "greedy"
+fleet_request = {"advance_watts": None, "shed_watts": None}
+fleet_pending_power = None
+deferred_event = None  # (event, reason, fields) waiting for the outcome of its settings change
+run_eta = None
+compact_status = False
+explore_stats = {}
+explore_trial = None
+last_explore_time = None
 
 def signal_handler(sig, frame):
     global is_interrupted
     is_interrupted = True
     print(ORANGE + "\nStopping status logger..." + RESET)
 
-signal.signal(signal.SIGINT, signal_handler)
-
 def validate_ip(ip):
     pattern = r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$"
     if not re.match(pattern, ip):
@@ -159,35 +287,314 @@ def get_frequency_for_voltage(voltage, values_file):
                 return f
     return calculate_bm1370_frequency(voltage)
 
+def parse_values_csv(filename):
+    # Returns (comment and header lines, pairs sorted by voltage, whether the file has columns beyond
+    # voltage and frequency, as a values-found file does).
+    header_lines = []
+    pairs = []
+    extra_columns = False
+    first_row = True
+    with open(filename, 'r', encoding='utf-8-sig') as f:
+        for line in f:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.startswith('#'):
+                header_lines.append(line.rstrip("\r\n"))
+                continue
+            row = next(csv.reader([stripped]))
+            extra_columns = extra_columns or len([cell for cell in row if cell.strip()]) > 2
+            if first_row:
+                first_row = False
+                if not row[0].strip().isdigit():
+                    header_lines.append(line.rstrip("\r\n"))
+                    continue  # Header row, e.g. "Voltage,Frequency" or a values-found file header
+            if len(row) >= 2:
+                try:
+                    voltage = int(row[0])
+                    frequency = int(row[1])
+                    pairs.append((voltage, frequency))
+                except ValueError as e:
+                    print(ORANGE + f"Skipping invalid row in {filename}: {row} (Error: {e})" + RESET)
+                    continue
+    pairs.sort(key=lambda x: x[0])
+    return header_lines, pairs, extra_columns
+
 def read_values_csv(filename):
-    global value_pairs
+    global value_pairs, values_filename, values_mtime
+    try:
+        mtime = os.path.getmtime(filename)
+        _, pairs, _ = parse_values_csv(filename)
+        if not pairs:
+            raise ValueError("Values CSV file is empty or contains no valid voltage-frequency pairs")
+        value_pairs = pairs
+        values_filename = filename
+        values_mtime = mtime
+        print(GREEN + f"Loaded {len(value_pairs)} voltage-frequency pairs from {filename}" + RESET)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Values CSV file '{filename}' not found")
+    except Exception as e:
+        raise ValueError(f"Error reading values CSV file: {e}")
+
+def reload_values_csv_if_changed():
+    global values_mtime
+    if not values_filename:
+        return False
+    try:
+        mtime = os.path.getmtime(values_filename)
+    except OSError as e:
+        print(ORANGE + f"Could not check values CSV file for changes: {e}" + RESET)
+        return False
+    if mtime == values_mtime:
+        return False
     try:
+        read_values_csv(values_filename)
+    except (FileNotFoundError, ValueError) as e:
+        values_mtime = mtime
+        print(ORANGE + f"Keeping previous {len(value_pairs)} voltage-frequency pairs: {e}" + RESET)
+        return False
+    return True
+
+def read_profiles_csv(filename):
+    global profiles
+    try:
+        base_dir = os.path.dirname(os.path.abspath(filename))
         with open(filename, 'r', encoding='utf-8-sig') as f:
             reader = csv.reader(f)
-            value_pairs = []
+            entries = []
             for row in reader:
                 if not row or row[0].strip().startswith('#'):
                     continue
-                if len(row) >= 2:
-                    try:
-                        voltage = int(row[0])
-                        frequency = int(row[1])
-                        value_pairs.append((voltage, frequency))
-                    except ValueError as e:
-                        print(ORANGE + f"Skipping invalid row in {filename}: {row} (Error: {e})" + RESET)
-                        continue
-        value_pairs.sort(key=lambda x: x[0])
-        if not value_pairs:
-            raise ValueError("Values CSV file is empty or contains no valid voltage-frequency pairs")
-        print(GREEN + f"Loaded {len(value_pairs)} voltage-frequency pairs from {filename}" + RESET)
+                try:
+                    max_temp = float(row[0])
+                except ValueError:
+                    continue  # Header row
+                if len(row) < 2 or not row[1].strip():
+                    raise ValueError(f"Profile row {row} has no values file")
+                values_file = os.path.join(base_dir, row[1].strip())
+                if not os.path.exists(values_file):
+                    raise ValueError(f"Values file '{values_file}' for profile {max_temp}°C not found")
+                entries.append((max_temp, values_file))
+        entries.sort(key=lambda x: x[0])
+        if not entries:
+            raise ValueError("Profiles CSV file contains no profiles")
+        profiles = entries
+        print(GREEN + f"Loaded {len(profiles)} ambient profiles from {filename}" + RESET)
     except FileNotFoundError:
-        raise FileNotFoundError(f"Values CSV file '{filename}' not found")
+        raise FileNotFoundError(f"Profiles CSV file '{filename}' not found")
     except Exception as e:
-        raise ValueError(f"Error reading values CSV file: {e}")
+        raise ValueError(f"Error reading profiles CSV file: {e}")
+
+def profile_index_for_temp(temp):
+    for i, (max_temp, _) in enumerate(profiles):
+        if temp <= max_temp:
+            return i
+    return len(profiles) - 1
+
+def refresh_thermal_baseline():
+    global thermal_baseline
+    # Only once a full window of readings has been taken since the last settings change
+    if len(recent_temps) < CONFIG["baseline_readings"]:
+        return
+    thermal_baseline = {
+        "temp": sum(temp for temp, _ in recent_temps) / len(recent_temps),
+        "vrTemp": sum(vrtemp for _, vrtemp in recent_temps) / len(recent_temps),
+    }
+
+def select_profile_for_baseline():
+    global active_profile_index
+    if not profiles or thermal_baseline is None:
+        return False
+    temp = thermal_baseline["temp"]
+    if active_profile_index is not None:
+        lower = profiles[active_profile_index - 1][0] if active_profile_index > 0 else float('-inf')
+        upper = profiles[active_profile_index][0] if active_profile_index < len(profiles) - 1 else float('inf')
+        if lower - CONFIG["profile_hysteresis"] < temp <= upper + CONFIG["profile_hysteresis"]:
+            return False
+    new_index = profile_index_for_temp(temp)
+    try:
+        read_values_csv(profiles[new_index][1])
+    except (FileNotFoundError, ValueError) as e:
+        print(RED + f"Could not switch to profile for {temp:.2f}°C: {e}" + RESET)
+        return False
+    active_profile_index = new_index
+    log_event("profile", f"thermal baseline {temp:.2f}°C", max_baseline_temp=profiles[new_index][0],
+              values_file=profiles[new_index][1])
+    print(GREEN + f"Thermal baseline {temp:.2f}°C: using profile ≤{profiles[new_index][0]}°C ({profiles[new_index][1]})" + RESET)
+    return True
+
+def ladder_pair_at_or_below(core_voltage):
+    lower_pairs = [pair for pair in value_pairs if pair[0] <= core_voltage]
+    return lower_pairs[-1] if lower_pairs else value_pairs[0]
+
+def validate_config_section(name, section, allow_model=False):
+    if not isinstance(section, dict):
+        raise ValueError(f"'{name}' must be a table of settings")
+    values = {}
+    for key, value in section.items():
+        if allow_model and key == "model":
+            if not isinstance(value, str):
+                raise ValueError(f"'{name}': model must be a string such as \"BM1370\"")
+            continue
+        if key not in CONFIG:
+            raise ValueError(f"'{name}': unknown setting '{key}'")
+        if key == "reboot" and value is None:
+            values[key] = None
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"'{name}': '{key}' must be a number")
+        if key in INTEGER_CONFIG_KEYS and not isinstance(value, int):
+            raise ValueError(f"'{name}': '{key}' must be a whole number")
+        if value < 0 or (value == 0 and key in POSITIVE_CONFIG_KEYS):
+            raise ValueError(f"'{name}': '{key}' must be {'positive' if key in POSITIVE_CONFIG_KEYS else 'non-negative'}")
+        values[key] = value
+    return values
+
+def check_config_limits(name, values):
+    for warning_key, critical_key in (("max_temp_warning", "max_temp_critical"),
+                                      ("max_vrtemp_warning", "max_vrtemp_critical"),
+                                      ("max_power_warning", "max_power_critical")):
+        if values[warning_key] > values[critical_key]:
+            raise ValueError(f"'{name}': {warning_key} ({values[warning_key]}) exceeds {critical_key} ({values[critical_key]})")
+
+def load_config_file(filename):
+    try:
+        if filename.lower().endswith(".toml"):
+            try:
+                import tomllib
+            except ImportError:
+                raise ValueError("TOML config files require Python 3.11 or newer; use a .json file instead")
+            with open(filename, "rb") as f:
+                data = tomllib.load(f)
+        else:
+            with open(filename, "r", encoding="utf-8-sig") as f:
+                data = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file '{filename}' not found")
+    except ValueError as e:
+        raise ValueError(f"Error reading config file {filename}: {e}")
+
+    if not isinstance(data, dict):
+        raise ValueError(f"Config file {filename} must contain a table of settings")
+    unknown_sections = set(data) - {"defaults", "models", "devices"}
+    if unknown_sections:
+        raise ValueError(f"Unknown sections in config file {filename}: {', '.join(sorted(unknown_sections))}")
+    for section_name in ("models", "devices"):
+        if not isinstance(data.get(section_name, {}), dict):
+            raise ValueError(f"'{section_name}' in config file {filename} must be a table keyed by "
+                             f"{'ASIC model' if section_name == 'models' else 'IP address'}")
+
+    # Compile each layer into a fully merged settings dict, so resolving a device is two dict lookups.
+    defaults = {**CONFIG, **validate_config_section("defaults", data.get("defaults", {}))}
+    check_config_limits("defaults", defaults)
+    models = {}
+    for model, section in data.get("models", {}).items():
+        models[model] = {**defaults, **validate_config_section(f"models.{model}", section)}
+        check_config_limits(f"models.{model}", models[model])
+    devices = {}
+    for ip, section in data.get("devices", {}).items():
+        try:
+            validate_ip(ip)
+        except ValueError:
+            raise ValueError(f"'devices.{ip}' is not a valid IP address")
+        overrides = validate_config_section(f"devices.{ip}", section, allow_model=True)
+        model = section.get("model")
+        check_config_limits(f"devices.{ip}", {**models.get(model, defaults), **overrides})
+        if model is None:
+            # The model is read from the Bitaxe at startup, so the overrides must suit every model section
+            for other_model, model_values in models.items():
+                check_config_limits(f"devices.{ip} (model {other_model})", {**model_values, **overrides})
+        devices[ip] = (model, overrides)
+    return {"defaults": defaults, "models": models, "devices": devices}
+
+def resolve_config(compiled_config, ip, model=None):
+    device_model, overrides = compiled_config["devices"].get(ip, (None, {}))
+    model = device_model or model
+    return {**compiled_config["models"].get(model, compiled_config["defaults"]), **overrides}
+
+def config_model_for_device(compiled_config, ip):
+    device_model, _ = compiled_config["devices"].get(ip, (None, {}))
+    if device_model or not compiled_config["models"]:
+        return device_model
+    try:
+        return api_request(validate_ip(ip), "GET", "/api/system/info").get("ASICModel")
+    except OSError as e:
+        print(ORANGE + f"Could not read the ASIC model for per-model config defaults: {e}" + RESET)
+        return None
+
+def acquire_values_lock(filename, timeout=10):
+    # A lock file created with O_EXCL works the same on every platform and network share.
+    lock_filename = f"{filename}.lock"
+    deadline = time.time() + timeout
+    while True:
+        try:
+            os.close(os.open(lock_filename, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_filename) > 30:
+                    os.remove(lock_filename)  # Left behind by a process that died while writing
+                    continue
+            except OSError:
+                continue  # Released while we looked at it
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.1)
+        except OSError as e:
+            print(RED + f"Error locking {filename}: {e}" + RESET)
+            return False
+
+def release_values_lock(filename):
+    try:
+        os.remove(f"{filename}.lock")
+    except OSError:
+        pass
+
+def update_values_csv(filename, voltage, frequency):
+    global value_pairs, values_mtime
+    if not acquire_values_lock(filename):
+        print(RED + f"Could not lock {filename}; {voltage} mV -> {frequency} MHz was not written" + RESET)
+        return
+    temp_filename = None
+    try:
+        # Merge into the file as it is now, so rows and promotions written by other processes since
+        # this one loaded it are kept.
+        try:
+            header_lines, pairs, extra_columns = parse_values_csv(filename)
+        except FileNotFoundError:
+            header_lines, pairs, extra_columns = [], [], False
+        if extra_columns:
+            print(RED + f"Not updating {filename}: it has columns beyond Voltage,Frequency (e.g. a values-found file)" + RESET)
+            return
+        merged = dict(pairs)
+        merged[voltage] = frequency
+        if not header_lines:
+            header_lines = ["Voltage,Frequency"]
+        fd, temp_filename = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)),
+                                             prefix=f"{os.path.basename(filename)}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write("\n".join(header_lines) + "\n")
+            for volt, freq in sorted(merged.items()):
+                f.write(f"{volt},{freq}\n")
+        os.replace(temp_filename, filename)
+        temp_filename = None
+        value_pairs = sorted(merged.items())
+        values_mtime = os.path.getmtime(filename)
+        print(GREEN + f"Updated {filename}: {voltage} mV -> {frequency} MHz ({len(value_pairs)} pairs)" + RESET)
+    except (OSError, ValueError) as e:
+        print(RED + f"Error updating values CSV file: {e}" + RESET)
+    finally:
+        if temp_filename:
+            try:
+                os.remove(temp_filename)
+            except OSError:
+                pass
+        release_values_lock(filename)
 
 def parse_arguments():
     parser = argparse.ArgumentParser(
-        description="Bitaxe status logger for monitoring hashrate, temperature, and power. Configuration values (e.g., test duration, safety thresholds) are defined in the script's CONFIG dictionary and can be viewed in the code. Some options below override these defaults."
+        description="Bitaxe status logger for monitoring hashrate, temperature, and power. Configuration values (e.g., test duration, safety thresholds) default to the script's CONFIG dictionary and can be overridden per model or per device with -config. Some options below override these defaults.",
+        epilog="One-shot commands: 'status -ip IP', 'set -ip IP -v MV -f MHZ', 'reboot -ip IP' (status, set and reboot also take '-inventory FILE' instead of -ip), 'validate-values FILE', 'journal FILE', 'fleet DIR', 'dashboard DIR' and 'discover CIDR'. Run e.g. 'bitaxe_status_logger.py status -h' for details."
     )
     parser.add_argument(
         "-v", "--voltage",
@@ -218,21 +625,69 @@ def parse_arguments():
     parser.add_argument(
         "-range",
         type=int,
-        default=CONFIG["range"],
         help=f"Frequency range in MHz to test above and below the initial or calculated frequency (default: {CONFIG['range']} MHz, ignored in monitor mode). Controls the sweep width around the center frequency."
     )
     parser.add_argument(
         "-step",
         type=int,
-        default=CONFIG["step"],
         help=f"Frequency step size in MHz (default: {CONFIG['step']} MHz, ignored in monitor mode). Determines the increment between tested frequencies in the sweep."
     )
     parser.add_argument(
         "-reboot",
         type=int,
-        default=CONFIG["reboot"],
         help=f"Number of consecutive identical hashrate readings to trigger a reboot (default: {CONFIG['reboot']}, disabled if None). Helps recover from potential hangs or stalls."
     )
+    parser.add_argument(
+        "-config",
+        type=str,
+        help="Path to a JSON (or, on Python 3.11+, TOML) config file with 'defaults', 'models' and 'devices' sections overriding CONFIG. Device sections are keyed by IP; the model comes from the device's 'model' key or the Bitaxe's reported ASICModel. -range, -step and -reboot still take precedence."
+    )
+    parser.add_argument(
+        "-journal",
+        type=str,
+        help="Append a JSON line for every settings change, fallback, advance, reboot, ladder promotion and profile switch to this file, with the device, reason, current metrics and time to verified apply. Query it with the 'journal' command."
+    )
+    parser.add_argument(
+        "-fleet-dir",
+        dest="fleet_dir",
+        type=str,
+        help="Shared directory where every process publishes its device's live power, hashrate and temperatures as <ip>.json. Used by -power-budget and the 'fleet' command."
+    )
+    parser.add_argument(
+        "-power-budget",
+        dest="power_budget",
+        type=float,
+        help="Total watts allowed across all fresh devices in -fleet-dir (monitor mode with -values or -profiles). A device only advances up its ladder when the budget has room for the estimated increase, and devices step down when the total is over budget."
+    )
+    parser.add_argument(
+        "-budget-policy",
+        dest="budget_policy",
+        choices=["greedy", "fair"],
+        default="greedy",
+        help="How -power-budget shares headroom: 'greedy' favours the devices with the best hashrate per watt and sheds the worst first; 'fair' lets the lowest-power devices climb first and sheds the highest first (default: greedy)."
+    )
+    parser.add_argument(
+        "-order",
+        choices=["ascending", "serpentine", "cooldown", "random"],
+        default="ascending",
+        help="Order of sweep runs: 'ascending' walks frequency upward for each voltage in turn; 'serpentine' alternates direction per voltage so consecutive runs stay close; 'cooldown' runs the whole voltage x frequency grid from lowest to highest estimated power; 'random' shuffles all runs (see -seed) to break time correlation (default: ascending)."
+    )
+    parser.add_argument(
+        "-retests",
+        type=int,
+        default=0,
+        help="Extra passes over every sweep run (default: 0). Passes alternate direction, or are shuffled together with -order random; the best frequency per voltage is chosen by mean hashrate across passes."
+    )
+    parser.add_argument(
+        "-seed",
+        type=int,
+        help="Random seed for -order random, to reproduce a run order"
+    )
+    parser.add_argument(
+        "-compact",
+        action="store_true",
+        help="Print one status line per poll instead of the full status block"
+    )
     parser.add_argument(
         "-m", "--monitor",
         action="store_true",
@@ -243,9 +698,48 @@ def parse_arguments():
         type=str,
         help="Path to values.csv file with voltage, frequency, and hashrate (used in monitor mode or with -start and -stop). Provides voltage-frequency pairs for testing or monitoring."
     )
+    parser.add_argument(
+        "-update-values",
+        dest="update_values",
+        action="store_true",
+        help="Write new voltage-frequency pairs back into the -values file: each voltage's best frequency as soon as it finishes in a sweep (-start/-stop), or frequencies promoted by -explore in monitor mode. Monitor mode instances using the same file pick up the new pairs without restarting. Comment and header lines are kept; data rows are rewritten sorted by voltage."
+    )
+    parser.add_argument(
+        "-profiles",
+        type=str,
+        help="Path to a profiles CSV for monitor mode with rows 'MaxBaselineTemp,ValuesFile'. The ladder comes from the first profile whose MaxBaselineTemp is at or above the chip temperature read when settings are applied (the last profile covers anything hotter). Replaces -values; values file paths are relative to the profiles file."
+    )
+    parser.add_argument(
+        "-explore",
+        type=int,
+        help="In monitor mode with -values, periodically test frequencies up to this many MHz above and below the current ladder frequency for short windows (see explore_* in CONFIG) and promote a better frequency into the ladder. Candidates are chosen with a UCB1 multi-armed bandit."
+    )
 
     args = parser.parse_args()
 
+    if args.config:
+        try:
+            compiled_config = load_config_file(args.config)
+            validate_ip(args.ip_address)
+        except (FileNotFoundError, ValueError) as e:
+            parser.error(str(e))
+        model = config_model_for_device(compiled_config, args.ip_address)
+        device_config = resolve_config(compiled_config, args.ip_address, model)
+        try:
+            check_config_limits(f"{args.ip_address} (model: {model or 'unknown'})", device_config)
+        except ValueError as e:
+            parser.error(f"--config {args.config}: {e}")
+        changed = sorted(key for key in CONFIG if device_config[key] != CONFIG[key])
+        CONFIG.update(device_config)
+        print(GREEN + f"Loaded config from {args.config} for {args.ip_address} (model: {model or 'unknown'}): "
+                      f"{', '.join(f'{key}={CONFIG[key]}' for key in changed) or 'no changes'}" + RESET)
+    if args.range is None:
+        args.range = CONFIG["range"]
+    if args.step is None:
+        args.step = CONFIG["step"]
+    if args.reboot is None:
+        args.reboot = CONFIG["reboot"]
+
     if args.start_voltage is not None or args.stop_voltage is not None:
         if args.start_voltage is None or args.stop_voltage is None:
             parser.error("Both --start_voltage and --stop_voltage must be provided together")
@@ -266,11 +760,15 @@ def parse_arguments():
             parser.error("--voltage is required unless --start_voltage and --stop_voltage are used")
         if args.voltage < CONFIG["min_core_voltage"]:
             parser.error(f"Voltage must be at least {CONFIG['min_core_voltage']} mV")
-        if not args.values and args.frequency is None:
-            parser.error("--frequency is required in monitor mode or single voltage tests unless --values is provided")
+        if not args.values and not args.profiles and args.frequency is None:
+            parser.error("--frequency is required in monitor mode or single voltage tests unless --values or --profiles is provided")
         if args.frequency is not None and args.frequency < CONFIG["min_frequency"]:
             parser.error(f"Frequency must be at least {CONFIG['min_frequency']} MHz")
 
+    if args.retests < 0:
+        parser.error("Re-tests must be non-negative")
+    if args.monitor and (args.order != "ascending" or args.retests or args.seed is not None):
+        parser.error("--order, --retests and --seed are not used in monitor mode")
     if args.range < 0:
         parser.error("Range must be non-negative")
     if args.step <= 0:
@@ -279,8 +777,48 @@ def parse_arguments():
         parser.error("Reboot threshold must be positive")
     if args.values and not args.monitor and (args.start_voltage is None and args.stop_voltage is None):
         parser.error("The --values option is only valid in monitor mode (-m) or with --start and --stop")
+    if args.profiles:
+        if not args.monitor:
+            parser.error("--profiles is only valid in monitor mode (-m)")
+        if args.values:
+            parser.error("--profiles cannot be used with --values")
+    if args.power_budget is not None:
+        if not args.fleet_dir:
+            parser.error("--power-budget requires --fleet-dir")
+        if not args.monitor or not (args.values or args.profiles):
+            parser.error("--power-budget requires monitor mode (-m) with --values or --profiles")
+        if args.power_budget <= 0:
+            parser.error("Power budget must be positive")
+    if args.fleet_dir and not os.path.isdir(args.fleet_dir):
+        parser.error(f"Fleet directory '{args.fleet_dir}' does not exist")
+    if args.update_values and not args.values and not args.profiles:
+        parser.error("--update-values requires --values or --profiles")
+    if args.explore is not None:
+        if not args.monitor or not (args.values or args.profiles):
+            parser.error("--explore requires monitor mode (-m) with --values or --profiles")
+        if args.explore <= 0:
+            parser.error("Explore range must be positive")
     if args.values:
         read_values_csv(args.values)
+    if args.profiles:
+        read_profiles_csv(args.profiles)
+        # Every profile must have a ladder, since monitor mode can switch to any of them
+        for _, filename in profiles:
+            try:
+                pairs = parse_values_csv(filename)[1]
+            except (OSError, csv.Error) as e:
+                parser.error(f"--profiles values file {filename} could not be read: {e}")
+            if not pairs:
+                parser.error(f"--profiles values file {filename} is empty or contains no valid voltage-frequency pairs")
+    if args.update_values:
+        for filename in [args.values] if args.values else [values_file for _, values_file in profiles]:
+            try:
+                extra_columns = parse_values_csv(filename)[2]
+            except (OSError, ValueError, csv.Error):
+                continue  # Reported when the file is loaded
+            if extra_columns:
+                parser.error(f"--update-values needs a plain Voltage,Frequency file, but {filename} has more columns "
+                             f"(e.g. a values-found file); copy its first two columns into a values file")
 
     return (
         args.voltage,
@@ -292,10 +830,36 @@ def parse_arguments():
         args.step,
         args.reboot,
         args.monitor,
-        args.values
+        args.values,
+        args.update_values,
+        args.explore,
+        args.profiles,
+        args.journal,
+        args.fleet_dir,
+        args.power_budget,
+        args.budget_policy,
+        args.order,
+        args.retests,
+        args.seed,
+        args.compact
     )
 
-def fetch_system_info(run_min_values, run_max_values, run_sum_values, run_count_values, hashrate_readings):
+def fetch_thermal_baseline():
+    global thermal_baseline
+    import requests
+    try:
+        response = requests.get(f"{bitaxe_ip}/api/system/info", timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        thermal_baseline = {"temp": data.get("temp", 0), "vrTemp": data.get("vrTemp", 0)}
+        return True
+    except requests.RequestException as e:
+        print(RED + f"Error fetching thermal baseline: {e}" + RESET)
+        return False
+
+def read_system_info():
+    # Updates system_info only; fetch_system_info also adds the reading to the run and global statistics.
+    import requests
     try:
         response = requests.get(f"{bitaxe_ip}/api/system/info", timeout=10)
         response.raise_for_status()
@@ -310,63 +874,199 @@ def fetch_system_info(run_min_values, run_max_values, run_sum_values, run_count_
         system_info["coreVoltage"] = data.get("coreVoltage", 1250)
         system_info["coreVoltageActual"] = data.get("coreVoltageActual", 1250)
         system_info["jth"] = system_info["power"] / (system_info["hashRate"] / 1000) if system_info["hashRate"] > 0 else 0
-        
-        for key in system_info:
-            run_min_values[key] = min(run_min_values[key], system_info[key])
-            run_max_values[key] = max(run_max_values[key], system_info[key])
-            global_min_values[key] = min(global_min_values[key], system_info[key])
-            global_max_values[key] = max(global_max_values[key], system_info[key])
-            run_sum_values[key] += system_info[key]
-            run_count_values[key] += 1
-        
-        hashrate_readings.append(system_info["hashRate"])
-        
         return True
     except requests.RequestException as e:
         print(RED + f"Error fetching system info: {e}" + RESET)
         return False
 
-def set_system_settings(frequency, core_voltage):
+def fetch_system_info(run_min_values, run_max_values, run_sum_values, run_count_values, hashrate_readings):
+    if not read_system_info():
+        return False
+
+    for key in system_info:
+        run_min_values[key] = min(run_min_values[key], system_info[key])
+        run_max_values[key] = max(run_max_values[key], system_info[key])
+        global_min_values[key] = min(global_min_values[key], system_info[key])
+        global_max_values[key] = max(global_max_values[key], system_info[key])
+        run_sum_values[key] += system_info[key]
+        run_count_values[key] += 1
+
+    hashrate_readings.append(system_info["hashRate"])
+    recent_temps.append((system_info["temp"], system_info["vrTemp"]))
+    del recent_temps[:-CONFIG["baseline_readings"]]
+    return True
+
+def set_system_settings(frequency, core_voltage, reason=""):
+    global thermal_baseline
+    import requests
     frequency = max(CONFIG["min_frequency"], frequency)
     core_voltage = max(CONFIG["min_core_voltage"], core_voltage)
+    apply_start = time.time()
+    event_fields = {"frequency": frequency, "core_voltage": core_voltage}
     try:
         payload = {"frequency": frequency, "coreVoltage": core_voltage}
         print(GREEN + f"Sending PATCH request to {bitaxe_ip}/api/system with payload: {payload}" + RESET)
         response = requests.patch(f"{bitaxe_ip}/api/system", json=payload, timeout=10)
         response.raise_for_status()
         print(GREEN + f"Set frequency to {frequency} MHz, core voltage to {core_voltage} mV" + RESET)
-        
-        time.sleep(5)
-        try:
-            response = requests.get(f"{bitaxe_ip}/api/system/info", timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            actual_freq = data.get("frequency", 0)
-            actual_volt = data.get("coreVoltage", 0)
-            print(GREEN + f"Verified settings: Actual frequency {actual_freq} MHz, actual core voltage {actual_volt} mV" + RESET)
-            if abs(actual_freq - frequency) > 1 or abs(actual_volt - core_voltage) > 1:
-                print(RED + f"Error: Settings did not apply correctly. Requested: {frequency} MHz, {core_voltage} mV; "
-                            f"Actual: {actual_freq} MHz, {actual_volt} mV" + RESET)
-                return False
-        except requests.RequestException as e:
-            print(RED + f"Could not verify settings: {e}" + RESET)
+
+        # Poll until the Bitaxe reports the new settings, so apply_seconds is the real time to verified apply
+        data = None
+        verify_error = None
+        while True:
+            time.sleep(CONFIG["apply_poll_interval"])
+            try:
+                response = requests.get(f"{bitaxe_ip}/api/system/info", timeout=10)
+                response.raise_for_status()
+                data = response.json()
+                verify_error = None
+                if (abs(data.get("frequency", 0) - frequency) <= 1 and
+                        abs(data.get("coreVoltage", 0) - core_voltage) <= 1):
+                    break
+            except requests.RequestException as e:
+                verify_error = e
+            if time.time() - apply_start >= CONFIG["apply_timeout"]:
+                break
+        apply_seconds = round(time.time() - apply_start, 2)
+        if data is None or verify_error is not None:
+            print(RED + f"Could not verify settings: {verify_error}" + RESET)
+            log_event("settings", reason, ok=False, error=f"verify failed: {verify_error}", **event_fields)
             return False
-        
+
+        actual_freq = data.get("frequency", 0)
+        actual_volt = data.get("coreVoltage", 0)
+        thermal_baseline = {"temp": data.get("temp", 0), "vrTemp": data.get("vrTemp", 0)}
+        recent_temps.clear()  # Readings from before the change no longer describe the current settings
+        print(GREEN + f"Verified settings: Actual frequency {actual_freq} MHz, actual core voltage {actual_volt} mV" + RESET)
+        event_fields.update(actual_frequency=actual_freq, actual_core_voltage=actual_volt)
+        if abs(actual_freq - frequency) > 1 or abs(actual_volt - core_voltage) > 1:
+            print(RED + f"Error: Settings did not apply correctly within {CONFIG['apply_timeout']}s. "
+                        f"Requested: {frequency} MHz, {core_voltage} mV; Actual: {actual_freq} MHz, {actual_volt} mV" + RESET)
+            log_event("settings", reason, ok=False, error="settings did not apply", **event_fields)
+            return False
+
+        log_event("settings", reason, ok=True, apply_seconds=apply_seconds, **event_fields)
         return True
     except requests.RequestException as e:
         print(RED + f"Error setting system settings (PATCH /api/system): {e}" + RESET)
+        log_event("settings", reason, ok=False, error=str(e), **event_fields)
         return False
 
-def reboot_bitaxe():
+def reboot_bitaxe(reason=""):
+    import requests
     try:
         response = requests.post(f"{bitaxe_ip}/api/system/restart", timeout=10)
         response.raise_for_status()
         print(GREEN + "Bitaxe rebooted successfully." + RESET)
+        log_event("reboot", reason, ok=True)
         return True
     except requests.RequestException as e:
         print(RED + f"Error rebooting Bitaxe: {e}" + RESET)
+        log_event("reboot", reason, ok=False, error=str(e))
         return False
 
+def log_event(event, reason="", **fields):
+    if not journal_filename:
+        return
+    now = datetime.now()
+    record = {
+        "time": now.isoformat(timespec="seconds"),
+        "ts": round(now.timestamp(), 3),
+        "device": bitaxe_ip.split("://", 1)[-1] if bitaxe_ip else None,
+        "event": event,
+        "reason": reason,
+        "metrics": {key: system_info[key] for key in ("frequency", "coreVoltage", "hashRate", "temp", "vrTemp", "power", "jth")},
+    }
+    record.update(fields)
+    try:
+        with open(journal_filename, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except IOError as e:
+        print(RED + f"Error writing to event journal: {e}" + RESET)
+
+def defer_event(event, reason="", **fields):
+    # Fallbacks and advances are journalled once their settings change has been tried,
+    # so each record says whether the move actually happened.
+    global deferred_event
+    deferred_event = (event, reason, fields)
+
+def log_deferred_event(applied):
+    global deferred_event
+    if deferred_event is not None:
+        event, reason, fields = deferred_event
+        deferred_event = None
+        log_event(event, reason, applied=applied, **fields)
+
+def read_journal(filename, device=None):
+    events = []
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                # Several processes append to one journal, so a torn or foreign line is skipped, not fatal
+                if (not isinstance(record, dict) or not isinstance(record.get("ts"), (int, float)) or
+                        not isinstance(record.get("metrics"), dict) or
+                        any(key not in record for key in ("time", "device", "event"))):
+                    print(ORANGE + f"Skipping invalid journal line {line_number} in {filename}" + RESET)
+                    continue
+                if device is None or record.get("device") == device:
+                    events.append(record)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Journal file '{filename}' not found")
+    events.sort(key=lambda record: record["ts"])
+    return events
+
+def fallbacks_per_day(events):
+    counts = {}
+    for record in events:
+        if record["event"] == "fallback" and record.get("applied", True):
+            day = record["time"][:10]
+            counts[day] = counts.get(day, 0) + 1
+    return counts
+
+def reboot_mtbf(events):
+    reboot_times = {}
+    for record in events:
+        if record["event"] == "reboot" and record.get("ok"):
+            reboot_times.setdefault(record["device"], []).append(record["ts"])
+    mtbf = {}
+    for device, times in reboot_times.items():
+        if len(times) > 1:
+            mtbf[device] = (times[-1] - times[0]) / (len(times) - 1)
+    return mtbf
+
+def fallback_losses(events):
+    # Pairs each fallback with the device's next advance back to the voltage it fell from.
+    # Returns (device, fallback record, recovery seconds or None, GH/s lost) tuples.
+    events_by_device = {}
+    for record in events:
+        events_by_device.setdefault(record["device"], []).append(record)
+    losses = []
+    for device, device_events in events_by_device.items():
+        # Walk backwards once, so these hold the earliest later advance time per target voltage
+        # and the earliest later hashrate per voltage when each fallback is reached.
+        first_advance_to = {}
+        first_hashrate_at = {}
+        for record in reversed(device_events):
+            if not record.get("applied", True):
+                continue  # The settings change failed, so the move never happened
+            if record["event"] == "fallback":
+                recovery_times = [ts for volt, ts in first_advance_to.items() if volt >= record.get("from_voltage", 0)]
+                before_hashrate = record["metrics"].get("hashRate")
+                after_hashrate = first_hashrate_at.get(record.get("to_voltage"))
+                lost = max(0.0, before_hashrate - after_hashrate) if before_hashrate is not None and after_hashrate is not None else None
+                losses.append((device, record, min(recovery_times) - record["ts"] if recovery_times else None, lost))
+            elif record["event"] == "advance":
+                first_advance_to[record.get("to_voltage", 0)] = record["ts"]
+            first_hashrate_at[record["metrics"].get("coreVoltage")] = record["metrics"].get("hashRate")
+    losses.sort(key=lambda loss: loss[1]["ts"])
+    return losses
+
 def log_data(frequency, core_voltage, run_number, note="", min_values=None, max_values=None, sum_values=None, count_values=None):
     global readings_filename, summaries_filename
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -389,7 +1089,8 @@ def log_data(frequency, core_voltage, run_number, note="", min_values=None, max_
     try:
         with open(summaries_filename, "a") as f:
             avg_hashrate = sum_values["hashRate"] / count_values["hashRate"] if count_values["hashRate"] > 0 else 0
-            f.write(f"\nRun {run_number} Summary: Frequency {frequency} MHz, Voltage {core_voltage} mV, Avg Hashrate {avg_hashrate:.2f} GH/s\n")
+            note_text = f" ({note})" if note else ""
+            f.write(f"\nRun {run_number} Summary: Frequency {frequency} MHz, Voltage {core_voltage} mV, Avg Hashrate {avg_hashrate:.2f} GH/s{note_text}\n")
             f.write("Metric,Min,Max,Avg\n")
             for key in min_values:
                 avg = sum_values[key] / count_values[key] if count_values[key] > 0 else 0
@@ -401,70 +1102,64 @@ def log_data(frequency, core_voltage, run_number, note="", min_values=None, max_
         print(RED + f"Error logging summaries data: {e}" + RESET)
         return summaries_filename
 
-def log_values_found(voltage, frequency, hashrate, min_freq_tested, max_freq_tested, avg_jth):
+def log_values_found(voltage, frequency, hashrate, min_freq_tested, max_freq_tested, avg_jth, baseline_temp, baseline_vrtemp):
     global values_found_filename
     try:
         with open(values_found_filename, "a") as f:
             if os.path.getsize(values_found_filename) == 0:
-                f.write("Voltage(mV),Frequency(MHz),Hashrate(GH/s),MinFreqTested(MHz),MaxFreqTested(MHz),AvgJTH(J/TH)\n")
-            f.write(f"{voltage},{frequency},{hashrate:.2f},{min_freq_tested},{max_freq_tested},{avg_jth:.2f}\n")
+                f.write("Voltage(mV),Frequency(MHz),Hashrate(GH/s),MinFreqTested(MHz),MaxFreqTested(MHz),AvgJTH(J/TH),"
+                        "BaselineTemp(°C),BaselineVRTemp(°C)\n")
+            f.write(f"{voltage},{frequency},{hashrate:.2f},{min_freq_tested},{max_freq_tested},{avg_jth:.2f},"
+                    f"{baseline_temp:.2f},{baseline_vrtemp:.2f}\n")
         print(GREEN + f"Logged best hashrate for {voltage} mV: {frequency} MHz, {hashrate:.2f} GH/s, "
-                      f"MinFreq {min_freq_tested} MHz, MaxFreq {max_freq_tested} MHz, AvgJTH {avg_jth:.2f} J/TH to {values_found_filename}" + RESET)
+                      f"MinFreq {min_freq_tested} MHz, MaxFreq {max_freq_tested} MHz, AvgJTH {avg_jth:.2f} J/TH, "
+                      f"Baseline {baseline_temp:.2f}°C/{baseline_vrtemp:.2f}°C VR to {values_found_filename}" + RESET)
     except IOError as e:
         print(RED + f"Error logging to values-found file: {e}" + RESET)
 
+def format_duration(seconds):
+    return f"{int(seconds // 3600)}h {int((seconds % 3600) // 60)}m"
+
+def set_run_eta(start_time, run_number, total_tests, voltage_runs_remaining=None, monitor_mode=False):
+    # Time estimates are stored once per run as absolute deadlines; status updates only subtract the time.
+    global run_eta
+    if voltage_runs_remaining is None:
+        voltage_runs_remaining = total_tests - run_number + 1
+    run_eta = {
+        "run": run_number,
+        "total_tests": total_tests,
+        "run_end": None if monitor_mode else start_time + CONFIG["run_duration"],
+        "voltage_end": None if monitor_mode else start_time + voltage_runs_remaining * CONFIG["run_duration"],
+        "sweep_end": None if monitor_mode else start_time + (total_tests - run_number + 1) * CONFIG["run_duration"],
+        "total_required": None if monitor_mode else total_tests * CONFIG["run_duration"],
+    }
+
 def display_status(
-    reading_count, total_readings, run_number, total_tests, start_time,
-    monitor_mode=False, min_values=None, max_values=None, sum_values=None, count_values=None,
-    start_voltage=None, stop_voltage=None, freq_range=None, freq_step=None, core_voltage=None,
-    current_voltage_index=None, total_voltages=None
+    reading_count, total_readings, run_number, total_tests,
+    monitor_mode=False, min_values=None, max_values=None, sum_values=None, count_values=None
 ):
     temp_color = RED if system_info["temp"] >= CONFIG["max_temp_critical"] else ORANGE if system_info["temp"] >= CONFIG["max_temp_warning"] else GREEN
     vrtemp_color = RED if system_info["vrTemp"] >= CONFIG["max_vrtemp_critical"] else ORANGE if system_info["vrTemp"] >= CONFIG["max_vrtemp_warning"] else GREEN
     power_color = RED if system_info["power"] >= CONFIG["max_power_critical"] else ORANGE if system_info["power"] >= CONFIG["max_power_warning"] else GREEN
     
+    if compact_status:
+        # One line per poll, for logs and for running many devices side by side
+        progress = "Monitor" if monitor_mode else f"Test {run_number}/{total_tests} ETA {format_duration(max(0, run_eta['sweep_end'] - time.time()))}"
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] {progress} {system_info['frequency']} MHz {system_info['coreVoltage']} mV "
+              f"{system_info['hashRate']:.2f} GH/s {system_info['jth']:.2f} J/TH Temp {temp_color}{system_info['temp']:.2f}{RESET}°C "
+              f"VR {vrtemp_color}{system_info['vrTemp']:.2f}{RESET}°C Power {power_color}{system_info['power']:.2f}{RESET} W")
+        return
+
     if monitor_mode:
         print(f"{GREEN}Status [{datetime.now().strftime('%H:%M:%S')}] Monitor Mode ({reading_count}/∞){RESET}")
     else:
-        elapsed_time = time.time() - start_time
-        test_time_remaining = CONFIG["run_duration"] - elapsed_time
-        test_hours = int(test_time_remaining // 3600)
-        test_minutes = int((test_time_remaining % 3600) // 60)
-        if test_time_remaining < 0:
-            test_time_remaining = 0
-            test_hours = 0
-            test_minutes = 0
-
-        remaining_frequencies = total_tests - run_number + 1
-        voltage_time_remaining = remaining_frequencies * CONFIG["run_duration"]
-        voltage_hours = int(voltage_time_remaining // 3600)
-        voltage_minutes = int((voltage_time_remaining % 3600) // 60)
-
-        total_time_required = 0
-        if start_voltage is not None and stop_voltage is not None:
-            num_voltages = stop_voltage - start_voltage + 1
-            expected_freq = calculate_bm1370_frequency(core_voltage) if core_voltage is not None else 400
-            num_frequencies = ((expected_freq + freq_range) - (expected_freq - freq_range)) // freq_step + 1
-            total_tests_all = num_voltages * num_frequencies
-            total_time_required = total_tests_all * CONFIG["run_duration"]
-        else:
-            total_time_required = total_tests * CONFIG["run_duration"]
-        total_hours = int(total_time_required // 3600)
-        total_minutes = int((total_time_required % 3600) // 60)
-
-        all_tests_time_remaining = 0
-        if start_voltage is not None and stop_voltage is not None:
-            remaining_voltages = total_voltages - current_voltage_index
-            all_tests_time_remaining = (remaining_voltages * num_frequencies * CONFIG["run_duration"]) + \
-                                       (remaining_frequencies - 1) * CONFIG["run_duration"] + test_time_remaining
-        else:
-            all_tests_time_remaining = (remaining_frequencies - 1) * CONFIG["run_duration"] + test_time_remaining
-        all_tests_hours = int(all_tests_time_remaining // 3600)
-        all_tests_minutes = int((all_tests_time_remaining % 3600) // 60)
-
+        now = time.time()
+        test_time_remaining = max(0, run_eta["run_end"] - now)
+        voltage_time_remaining = max(0, run_eta["voltage_end"] - now)
+        all_tests_time_remaining = max(0, run_eta["sweep_end"] - now)
         print(f"{GREEN}Status [{datetime.now().strftime('%H:%M:%S')}] Test {run_number}/{total_tests} ({reading_count}/{total_readings}) "
-              f"Test Time Remaining: {test_hours}h {test_minutes}m Voltage Time Remaining: {voltage_hours}h {voltage_minutes}m "
-              f"Total Time Required: {total_hours}h {total_minutes}m All Tests Time Remaining: {all_tests_hours}h {all_tests_minutes}m{RESET}")
+              f"Test Time Remaining: {format_duration(test_time_remaining)} Voltage Time Remaining: {format_duration(voltage_time_remaining)} "
+              f"Total Time Required: {format_duration(run_eta['total_required'])} All Tests Time Remaining: {format_duration(all_tests_time_remaining)}{RESET}")
     
     metrics = [
         ("Hashrate", "hashRate", "GH/s", GREEN),
@@ -495,8 +1190,9 @@ def display_summary(csv_files):
         summary_lines.append(f"{key.capitalize()}: {value:.2f}{unit}")
     if best_hashrates:
         summary_lines.append("")
-        for voltage, (freq, hashrate, _) in sorted(best_hashrates.items()):
-            summary_lines.append(f"Best Hashrate for Voltage {voltage} mV: {hashrate:.2f} GH/s at {freq} MHz")
+        for voltage, (freq, hashrate, _, baseline_temp, baseline_vrtemp) in sorted(best_hashrates.items()):
+            summary_lines.append(f"Best Hashrate for Voltage {voltage} mV: {hashrate:.2f} GH/s at {freq} MHz "
+                                 f"(baseline {baseline_temp:.2f}°C, VR {baseline_vrtemp:.2f}°C)")
 
     for line in summary_lines:
         print(GREEN + line + RESET)
@@ -517,22 +1213,162 @@ def display_summary(csv_files):
     else:
         print(ORANGE + "No CSV files generated." + RESET)
 
-def adjust_settings_based_on_values(frequency, core_voltage):
-    global value_pairs, last_fallback_time, last_fallback_voltage
-    if not value_pairs:
-        return frequency, core_voltage
+def within_advance_margin():
+    return (
+        system_info["temp"] <= CONFIG["max_temp_critical"] - CONFIG["critical_advance_margin"] and
+        system_info["vrTemp"] <= CONFIG["max_vrtemp_critical"] - CONFIG["critical_advance_margin"] and
+        system_info["power"] <= CONFIG["max_power_critical"] - CONFIG["critical_advance_margin"]
+    )
+
+def estimate_power(frequency, core_voltage, new_frequency, new_voltage):
+    # Dynamic power scales roughly with frequency x voltage squared.
+    return system_info["power"] * (new_frequency / frequency) * (new_voltage / core_voltage) ** 2
+
+def device_id():
+    return bitaxe_ip.split("://", 1)[-1]
+
+def publish_fleet_state():
+    global fleet_pending_power
+    if not fleet_dir:
+        return
+    if fleet_pending_power is not None and time.time() - fleet_pending_power[1] > CONFIG["readings_to_advance"] * CONFIG["status_interval"] * 2:
+        fleet_pending_power = None
+    state = {
+        "device": device_id(),
+        "ts": time.time(),
+        "frequency": system_info["frequency"],
+        "coreVoltage": system_info["coreVoltage"],
+        "hashRate": system_info["hashRate"],
+        "power": system_info["power"],
+        "temp": system_info["temp"],
+        "vrTemp": system_info["vrTemp"],
+        "jth": system_info["jth"],
+        "pending_power": fleet_pending_power[0] if fleet_pending_power else None,
+        "advance_watts": fleet_request["advance_watts"],
+        "shed_watts": fleet_request["shed_watts"],
+        "run": run_eta["run"] if run_eta else None,
+        "total_tests": None if run_eta is None or run_eta["run_end"] is None else run_eta["total_tests"],
+        "run_end": run_eta["run_end"] if run_eta else None,
+        "sweep_end": run_eta["sweep_end"] if run_eta else None,
+        # Each device's own limits, which may come from a per-model or per-device -config section
+        "limits": {key: CONFIG[key] for key in FLEET_LIMIT_KEYS},
+    }
+    state_filename = os.path.join(fleet_dir, f"{device_id()}.json")
+    try:
+        with open(f"{state_filename}.tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(f"{state_filename}.tmp", state_filename)
+    except OSError as e:
+        print(RED + f"Error publishing fleet state: {e}" + RESET)
+
+def is_fleet_state(state):
+    # Other JSON files (an inventory, a config file) may share the directory
+    return (isinstance(state, dict) and isinstance(state.get("device"), str) and
+            all(isinstance(state.get(key), (int, float)) for key in FLEET_STATE_NUMBER_KEYS))
+
+def read_fleet_states(directory):
+    states = []
+    now = time.time()
+    try:
+        filenames = [name for name in os.listdir(directory) if name.endswith(".json")]
+    except OSError as e:
+        print(RED + f"Error reading fleet directory: {e}" + RESET)
+        return states
+    for name in filenames:
+        try:
+            with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            continue  # Being replaced or removed by its owner
+        if is_fleet_state(state) and now - state["ts"] <= CONFIG["fleet_stale_after"]:
+            states.append(state)
+    return states
+
+def fleet_power(state):
+    return max(state["power"] or 0, state.get("pending_power") or 0)
+
+def fleet_efficiency(state):
+    return state["hashRate"] / state["power"] if state["power"] else 0
+
+def fleet_headroom(states):
+    return power_budget - CONFIG["power_budget_margin"] - sum(fleet_power(state) for state in states)
+
+def fleet_grants_advance():
+    # Every device runs the same allocation over the same shared snapshot, so each one
+    # can tell whether it is among the devices the budget has room for.
+    states = read_fleet_states(fleet_dir)
+    headroom = fleet_headroom(states)
+    advance_requests = [state for state in states if state.get("advance_watts") is not None]
+    if budget_policy == "fair":
+        advance_requests.sort(key=lambda state: (fleet_power(state), state["device"]))
+    else:
+        advance_requests.sort(key=lambda state: (-fleet_efficiency(state), state["device"]))
+    for state in advance_requests:
+        if state["advance_watts"] > headroom:
+            continue
+        headroom -= state["advance_watts"]
+        if state["device"] == device_id():
+            return True
+    return False
+
+def fleet_shed_required():
+    states = read_fleet_states(fleet_dir)
+    excess = sum(fleet_power(state) for state in states) - power_budget
+    if excess <= 0:
+        return False
+    candidates = [state for state in states if state.get("shed_watts")]
+    if budget_policy == "fair":
+        candidates.sort(key=lambda state: (-fleet_power(state), state["device"]))
+    else:
+        candidates.sort(key=lambda state: (fleet_efficiency(state), state["device"]))
+    for state in candidates:
+        if state["device"] == device_id():
+            return True
+        excess -= state["shed_watts"]
+        if excess <= 0:
+            break
+    return False
+
+def fleet_grant(new_power, action):
+    # Publishes the extra watts a change needs and reports whether the fleet allocation grants them
+    global fleet_pending_power
+    fleet_request["advance_watts"] = new_power - system_info["power"]
+    publish_fleet_state()
+    if not fleet_grants_advance():
+        print(ORANGE + f"{action} held by the fleet power budget (needs ~{fleet_request['advance_watts']:.2f} W)." + RESET)
+        return False
+    fleet_request["advance_watts"] = None
+    fleet_pending_power = (new_power, time.time())
+    return True
+
+def ladder_move_allowed(frequency, core_voltage, new_frequency, new_voltage):
+    # A reloaded ladder or a new profile may move up as well as down; moves that draw
+    # more power need the same margin and fleet grant as an advance.
+    new_power = estimate_power(frequency, core_voltage, new_frequency, new_voltage)
+    if new_power <= system_info["power"]:
+        return True
+    if not within_advance_margin():
+        print(ORANGE + f"Move to {new_frequency} MHz, {new_voltage} mV held until all metrics are within "
+                      f"{CONFIG['critical_advance_margin']} of their critical limits." + RESET)
+        return False
+    return power_budget is None or fleet_grant(new_power, f"Move to {new_frequency} MHz, {new_voltage} mV")
 
+def ladder_index(frequency, core_voltage):
     current_pair = (core_voltage, frequency)
     try:
-        current_index = value_pairs.index(current_pair)
+        return value_pairs.index(current_pair)
     except ValueError:
-        current_index = 0
         for i, (volt, _) in enumerate(value_pairs):
             if volt >= core_voltage:
-                current_index = max(0, i - 1)
-                break
-        else:
-            current_index = len(value_pairs) - 1
+                return max(0, i - 1)
+        return len(value_pairs) - 1
+
+def adjust_settings_based_on_values(frequency, core_voltage):
+    global value_pairs, last_fallback_time, last_fallback_voltage
+    if not value_pairs:
+        return frequency, core_voltage
+
+    current_index = ladder_index(frequency, core_voltage)
 
     critical_hit = (
         system_info["temp"] >= CONFIG["max_temp_critical"] or
@@ -550,16 +1386,30 @@ def adjust_settings_based_on_values(frequency, core_voltage):
                         f"Power: {system_info['power']:.2f} W). Dropping to {new_frequency} MHz, {new_voltage} mV." + RESET)
             last_fallback_time = time.time()
             last_fallback_voltage = core_voltage
+            defer_event("fallback", reason, from_frequency=frequency, from_voltage=core_voltage,
+                        to_frequency=new_frequency, to_voltage=new_voltage,
+                        lockout_until=round(last_fallback_time + CONFIG["advance_delay"], 3))
             return new_frequency, new_voltage
         else:
             print(RED + "Critical condition hit but already at lowest settings." + RESET)
             return frequency, core_voltage
 
-    safe_margin = (
-        system_info["temp"] <= CONFIG["max_temp_critical"] - CONFIG["critical_advance_margin"] and
-        system_info["vrTemp"] <= CONFIG["max_vrtemp_critical"] - CONFIG["critical_advance_margin"] and
-        system_info["power"] <= CONFIG["max_power_critical"] - CONFIG["critical_advance_margin"]
-    )
+    if power_budget is not None:
+        if current_index > 0:
+            lower_voltage, lower_frequency = value_pairs[current_index - 1]
+            fleet_request["shed_watts"] = system_info["power"] - estimate_power(frequency, core_voltage, lower_frequency, lower_voltage)
+        else:
+            fleet_request["shed_watts"] = None
+        fleet_request["advance_watts"] = None
+        publish_fleet_state()
+        if fleet_request["shed_watts"] is not None and fleet_shed_required():
+            new_voltage, new_frequency = value_pairs[current_index - 1]
+            print(ORANGE + f"Fleet power budget of {power_budget} W exceeded. Dropping to {new_frequency} MHz, {new_voltage} mV." + RESET)
+            defer_event("fallback", "fleet power budget", from_frequency=frequency, from_voltage=core_voltage,
+                        to_frequency=new_frequency, to_voltage=new_voltage)
+            return new_frequency, new_voltage
+
+    safe_margin = within_advance_margin()
 
     can_advance = True
     if last_fallback_time is not None and last_fallback_voltage is not None:
@@ -573,23 +1423,201 @@ def adjust_settings_based_on_values(frequency, core_voltage):
 
     if safe_margin and can_advance and current_index < len(value_pairs) - 1:
         new_voltage, new_frequency = value_pairs[current_index + 1]
+        if power_budget is not None:
+            new_power = estimate_power(frequency, core_voltage, new_frequency, new_voltage)
+            if not fleet_grant(new_power, f"Advance to {new_frequency} MHz, {new_voltage} mV"):
+                return frequency, core_voltage
         print(GREEN + f"All metrics safe (Temp: {system_info['temp']:.2f}°C, VR Temp: {system_info['vrTemp']:.2f}°C, "
                       f"Power: {system_info['power']:.2f} W). Increasing to {new_frequency} MHz, {new_voltage} mV." + RESET)
+        defer_event("advance", "metrics within advance margin", from_frequency=frequency, from_voltage=core_voltage,
+                    to_frequency=new_frequency, to_voltage=new_voltage)
         return new_frequency, new_voltage
     return frequency, core_voltage
 
+def explore_candidates(frequency, explore_range):
+    return [f for f in range(frequency - explore_range, frequency + explore_range + 1, CONFIG["explore_step"])
+            if f >= CONFIG["min_frequency"]]
+
+def explore_arm_stats(core_voltage):
+    # Trials are kept per ladder file (so per ambient profile) and voltage, and only the last
+    # explore_memory of them count: a sliding-window UCB that forgets results from other conditions.
+    stats = {}
+    for frequency, hashrate in explore_stats.get((values_filename, core_voltage), []):
+        trials, total = stats.get(frequency, (0, 0.0))
+        stats[frequency] = (trials + 1, total + hashrate)
+    return {frequency: (trials, total / trials) for frequency, (trials, total) in stats.items()}
+
+def choose_explore_frequency(frequency, core_voltage, explore_range):
+    candidates = explore_candidates(frequency, explore_range)
+    arm_stats = explore_arm_stats(core_voltage)
+    untried = [f for f in candidates if f not in arm_stats]
+    if untried:
+        return min(untried, key=lambda f: abs(f - frequency))
+    # UCB1 with hashrates min-max normalised across the candidates, so the exploration term
+    # is on the same scale as the (small) hashrate differences between neighbouring frequencies.
+    stats = {f: arm_stats[f] for f in candidates}
+    total_trials = sum(trials for trials, _ in stats.values())
+    low = min(mean for _, mean in stats.values())
+    high = max(mean for _, mean in stats.values())
+    spread = (high - low) or 1.0
+    def upper_confidence_bound(f):
+        trials, mean = stats[f]
+        return (mean - low) / spread + math.sqrt(2 * math.log(total_trials) / trials)
+    return max(candidates, key=upper_confidence_bound)
+
+def start_explore_trial(frequency, core_voltage, explore_range):
+    global explore_trial
+    if last_explore_time is not None and time.time() - last_explore_time < CONFIG["explore_interval"]:
+        return frequency
+    if not within_advance_margin():
+        return frequency
+    trial_frequency = choose_explore_frequency(frequency, core_voltage, explore_range)
+    if power_budget is not None and trial_frequency > frequency:
+        # A trial above the ladder frequency draws more power, so it needs a grant like an advance
+        trial_power = estimate_power(frequency, core_voltage, trial_frequency, core_voltage)
+        if not fleet_grant(trial_power, f"Exploration trial at {trial_frequency} MHz"):
+            return frequency
+    explore_trial = {
+        "voltage": core_voltage,
+        "frequency": trial_frequency,
+        "base_frequency": frequency,
+        "start_time": time.time(),
+        "readings": [],
+    }
+    print(GREEN + f"Starting exploration trial at {trial_frequency} MHz, {core_voltage} mV "
+                  f"(ladder frequency {frequency} MHz) for {CONFIG['explore_window']}s." + RESET)
+    return trial_frequency
+
+def cancel_explore_trial():
+    global explore_trial, last_explore_time
+    explore_trial = None
+    last_explore_time = time.time()
+
+def record_explore_result(core_voltage, frequency, hashrate):
+    history = explore_stats.setdefault((values_filename, core_voltage), [])
+    history.append((frequency, hashrate))
+    del history[:-CONFIG["explore_memory"]]
+    return explore_arm_stats(core_voltage)[frequency]
+
+def promote_explored_frequency(base_frequency, core_voltage, explore_range, update_values):
+    global value_pairs
+    arm_stats = explore_arm_stats(core_voltage)
+    base_trials, base_mean = arm_stats.get(base_frequency, (0, 0.0))
+    if base_trials < CONFIG["explore_min_trials"]:
+        return base_frequency
+    qualified = [(arm_stats[f][1], f) for f in explore_candidates(base_frequency, explore_range)
+                 if arm_stats.get(f, (0, 0.0))[0] >= CONFIG["explore_min_trials"]]
+    best_mean, best_frequency = max(qualified)
+    if best_frequency == base_frequency or best_mean <= base_mean * (1 + CONFIG["explore_promote_margin"] / 100):
+        return base_frequency
+    print(GREEN + f"Promoting {best_frequency} MHz at {core_voltage} mV into the ladder: {best_mean:.2f} GH/s "
+                  f"vs {base_mean:.2f} GH/s at {base_frequency} MHz." + RESET)
+    log_event("promote", "exploration", voltage=core_voltage, from_frequency=base_frequency, to_frequency=best_frequency,
+              base_hashrate=round(base_mean, 2), new_hashrate=round(best_mean, 2))
+    if update_values and values_filename:
+        update_values_csv(values_filename, core_voltage, best_frequency)
+    else:
+        value_pairs = [(v, best_frequency if v == core_voltage else f) for v, f in value_pairs]
+    return best_frequency
+
+def update_explore_trial(frequency, core_voltage, explore_range, update_values):
+    global explore_trial, last_explore_time
+    trial = explore_trial
+    elapsed_time = time.time() - trial["start_time"]
+    critical_hit = (
+        system_info["temp"] >= CONFIG["max_temp_critical"] or
+        system_info["vrTemp"] >= CONFIG["max_vrtemp_critical"] or
+        system_info["power"] >= CONFIG["max_power_critical"]
+    )
+    if critical_hit:
+        explore_trial = None
+        last_explore_time = time.time()
+        record_explore_result(core_voltage, trial["frequency"], 0.0)
+        print(RED + f"Critical condition during exploration trial at {trial['frequency']} MHz." + RESET)
+        # The usual fallback from the ladder pair: a rung down and the advance_delay lockout
+        return adjust_settings_based_on_values(trial["base_frequency"], core_voltage)
+    if power_budget is not None:
+        saving = system_info["power"] - estimate_power(frequency, core_voltage, trial["base_frequency"], core_voltage)
+        fleet_request["advance_watts"] = None
+        fleet_request["shed_watts"] = saving if saving > 0 else None
+        publish_fleet_state()
+        if fleet_request["shed_watts"] is not None and fleet_shed_required():
+            explore_trial = None
+            last_explore_time = time.time()
+            print(ORANGE + f"Fleet power budget of {power_budget} W exceeded. Ending exploration trial at "
+                          f"{trial['frequency']} MHz and returning to {trial['base_frequency']} MHz." + RESET)
+            return trial["base_frequency"], core_voltage
+    if elapsed_time >= CONFIG["explore_settle"]:
+        trial["readings"].append(system_info["hashRate"])
+    if elapsed_time < CONFIG["explore_window"]:
+        return frequency, core_voltage
+    explore_trial = None
+    last_explore_time = time.time()
+    if not trial["readings"]:
+        return trial["base_frequency"], core_voltage
+    avg_hashrate = sum(trial["readings"]) / len(trial["readings"])
+    trials, mean = record_explore_result(core_voltage, trial["frequency"], avg_hashrate)
+    print(GREEN + f"Exploration trial at {trial['frequency']} MHz, {core_voltage} mV: {avg_hashrate:.2f} GH/s "
+                  f"(mean {mean:.2f} GH/s over {trials} trials)." + RESET)
+    return promote_explored_frequency(trial["base_frequency"], core_voltage, explore_range, update_values), core_voltage
+
+def cooled_down():
+    return (
+        within_advance_margin() and
+        system_info["temp"] < CONFIG["max_temp_warning"] and
+        system_info["vrTemp"] < CONFIG["max_vrtemp_warning"] and
+        system_info["power"] < CONFIG["max_power_warning"]
+    )
+
+def wait_for_cooldown():
+    # Readings at the reduced fallback settings stay out of the run and global statistics
+    start_time = time.time()
+    print(ORANGE + "Waiting for temperature, VR temperature and power to drop below their warning limits "
+                   "before the next run..." + RESET)
+    while not is_interrupted:
+        if read_system_info():
+            publish_fleet_state()
+            if cooled_down():
+                print(GREEN + f"Cooled down after {time.time() - start_time:.0f}s (Temp: {system_info['temp']:.2f}°C, "
+                              f"VR Temp: {system_info['vrTemp']:.2f}°C, Power: {system_info['power']:.2f} W)." + RESET)
+                return
+        if time.time() - start_time >= CONFIG["cooldown_timeout"]:
+            print(ORANGE + f"Still above the warning limits after {CONFIG['cooldown_timeout']}s. Continuing with the next run." + RESET)
+            return
+        time.sleep(CONFIG["status_interval"])
+
+def record_run_result(frequency, core_voltage, sum_values, count_values, baseline):
+    global best_hashrate, best_frequency, best_voltage
+    avg_hashrate = sum_values["hashRate"] / count_values["hashRate"]
+    avg_jth = sum_values["jth"] / count_values["jth"] if count_values["jth"] > 0 else 0
+    point_results.setdefault((core_voltage, frequency), []).append(
+        (avg_hashrate, avg_jth, baseline["temp"], baseline["vrTemp"]))
+    # Re-tested points are compared by their mean, so a single lucky run cannot win.
+    best_hashrates.pop(core_voltage, None)
+    for (volt, freq), results in point_results.items():
+        if volt != core_voltage:
+            continue
+        means = [sum(values) / len(results) for values in zip(*results)]
+        if core_voltage not in best_hashrates or means[0] > best_hashrates[core_voltage][1]:
+            best_hashrates[core_voltage] = (freq, *means)
+    best_voltage = max(best_hashrates, key=lambda volt: best_hashrates[volt][1])
+    best_frequency, best_hashrate = best_hashrates[best_voltage][:2]
+
 def run_test(
     frequency, core_voltage, run_number, reboot_threshold, total_tests,
-    monitor_mode=False, values_file=None, start_voltage=None, stop_voltage=None,
-    freq_range=None, freq_step=None, voltage_index=None, total_voltages=None
+    monitor_mode=False, values_file=None, voltage_runs_remaining=None,
+    explore_range=None, update_values=False
 ):
-    global best_hashrate, best_frequency, best_voltage, critical_temp_reached, best_hashrates
-    if not set_system_settings(frequency, core_voltage):
+    global critical_temp_reached
+    if not set_system_settings(frequency, core_voltage, reason=f"run {run_number} start"):
         print(RED + f"Skipping run {run_number} at {frequency} MHz, {core_voltage} mV" + RESET)
         return None
 
-    print(GREEN + f"Run {run_number}: {frequency} MHz, {core_voltage} mV {'indefinitely' if monitor_mode else f'for {CONFIG['run_duration']}s'}" + RESET)
+    run_baseline = dict(thermal_baseline)
+    duration_text = "indefinitely" if monitor_mode else f"for {CONFIG['run_duration']}s"
+    print(GREEN + f"Run {run_number}: {frequency} MHz, {core_voltage} mV {duration_text}" + RESET)
     start_time = time.time()
+    set_run_eta(start_time, run_number, total_tests, voltage_runs_remaining, monitor_mode)
     last_log_time = start_time
     reading_count = 0
     total_readings = float('inf') if monitor_mode else int(CONFIG["run_duration"] / CONFIG["status_interval"])
@@ -601,6 +1629,8 @@ def run_test(
     last_hashrate = None
     identical_hashrate_count = 0
     readings_since_adjustment = 0
+    last_values_check = start_time
+    pending_ladder_pair = None
 
     while (monitor_mode or time.time() - start_time < CONFIG["run_duration"]) and not is_interrupted:
         if not fetch_system_info(run_min_values, run_max_values, run_sum_values, run_count_values, hashrate_readings):
@@ -610,6 +1640,7 @@ def run_test(
             continue
 
         reading_count += 1
+        publish_fleet_state()
 
         if reboot_threshold is not None:
             current_hashrate = system_info["hashRate"]
@@ -618,7 +1649,7 @@ def run_test(
                 if identical_hashrate_count >= reboot_threshold:
                     print(ORANGE + f"Detected {identical_hashrate_count} identical hashrate readings ({current_hashrate:.2f} GH/s). Rebooting Bitaxe..." + RESET)
                     log_data(frequency, core_voltage, run_number, note=f"Rebooted due to {identical_hashrate_count} identical hashrate readings")
-                    if reboot_bitaxe():
+                    if reboot_bitaxe(reason=f"{identical_hashrate_count} identical hashrate readings"):
                         time.sleep(30)
                         identical_hashrate_count = 0
                         last_hashrate = None
@@ -629,18 +1660,61 @@ def run_test(
                 last_hashrate = current_hashrate
 
         settings_changed = False
-        if monitor_mode and values_file and readings_since_adjustment >= CONFIG["readings_to_advance"]:
-            new_frequency, new_core_voltage = adjust_settings_based_on_values(frequency, core_voltage)
+        ladder_pair = None
+        if (monitor_mode and values_file and explore_trial is None and
+                time.time() - last_values_check >= CONFIG["values_reload_interval"]):
+            last_values_check = time.time()
+            refresh_thermal_baseline()
+            if select_profile_for_baseline() or reload_values_csv_if_changed():
+                pending_ladder_pair = ladder_pair_at_or_below(core_voltage)
+                if pending_ladder_pair == (core_voltage, frequency):
+                    pending_ladder_pair = None
+        if pending_ladder_pair is not None and explore_trial is None:
+            # Held upward moves are retried every reading until they are granted
+            if ladder_move_allowed(frequency, core_voltage, pending_ladder_pair[1], pending_ladder_pair[0]):
+                ladder_pair = pending_ladder_pair
+                pending_ladder_pair = None
+        if monitor_mode and values_file and ladder_pair is not None:
+            new_core_voltage, new_frequency = ladder_pair
+            print(GREEN + f"Values changed: moving from {frequency} MHz, {core_voltage} mV to {new_frequency} MHz, {new_core_voltage} mV." + RESET)
+            if set_system_settings(new_frequency, new_core_voltage, reason="values reload"):
+                frequency, core_voltage = new_frequency, new_core_voltage
+                settings_changed = True
+                readings_since_adjustment = 0
+                identical_hashrate_count = 0
+                log_data(frequency, core_voltage, run_number, note=f"Reloaded values: {frequency} MHz, {core_voltage} mV")
+            else:
+                print(RED + f"Failed to apply reloaded settings {new_frequency} MHz, {new_core_voltage} mV. Continuing with current settings." + RESET)
+        elif monitor_mode and values_file and (explore_trial is not None or
+                                               readings_since_adjustment >= CONFIG["readings_to_advance"]):
+            trial_started = False
+            if explore_trial is not None:
+                new_frequency, new_core_voltage = update_explore_trial(frequency, core_voltage, explore_range, update_values)
+                change_reason = deferred_event[0] if deferred_event is not None else "exploration trial end"
+            else:
+                new_frequency, new_core_voltage = adjust_settings_based_on_values(frequency, core_voltage)
+                change_reason = deferred_event[0] if deferred_event is not None else "advance"
+                if explore_range and new_frequency == frequency and new_core_voltage == core_voltage:
+                    new_frequency = start_explore_trial(frequency, core_voltage, explore_range)
+                    trial_started = explore_trial is not None
+                    change_reason = "exploration trial"
             if new_frequency != frequency or new_core_voltage != core_voltage:
-                if set_system_settings(new_frequency, new_core_voltage):
+                applied = set_system_settings(new_frequency, new_core_voltage, reason=change_reason)
+                log_deferred_event(applied)
+                if applied:
                     frequency, core_voltage = new_frequency, new_core_voltage
                     settings_changed = True
+                    pending_ladder_pair = None  # The ladder moved on without it
                     readings_since_adjustment = 0
                     identical_hashrate_count = 0
-                    note = f"Adjusted to {frequency} MHz, {core_voltage} mV"
+                    note = f"Exploring {frequency} MHz, {core_voltage} mV" if explore_trial is not None else f"Adjusted to {frequency} MHz, {core_voltage} mV"
                     log_data(frequency, core_voltage, run_number, note=note)
                 else:
                     print(RED + f"Failed to adjust settings to {new_frequency} MHz, {new_core_voltage} mV. Continuing with current settings." + RESET)
+                    if trial_started:
+                        cancel_explore_trial()
+            else:
+                log_deferred_event(False)
         elif not values_file or not monitor_mode:
             if (system_info["temp"] >= CONFIG["max_temp_critical"] or 
                 system_info["vrTemp"] >= CONFIG["max_vrtemp_critical"] or
@@ -653,20 +1727,15 @@ def run_test(
                           "critical power")
                 print(RED + f"Critical {reason} (Temp: {system_info['temp']:.2f}°C, VR Temp: {system_info['vrTemp']:.2f}°C, Power: {system_info['power']:.2f} W). "
                             f"Reducing to {new_frequency} MHz, {new_core_voltage} mV and stopping test." + RESET)
-                set_system_settings(new_frequency, new_core_voltage)
+                applied = set_system_settings(new_frequency, new_core_voltage, reason=f"reduced due to {reason}")
+                log_event("fallback", reason, applied=applied, from_frequency=frequency, from_voltage=core_voltage,
+                          to_frequency=new_frequency, to_voltage=new_core_voltage)
                 csv_filename = log_data(frequency, core_voltage, run_number,
                                        f"Reduced and stopped due to {reason}")
                 if not monitor_mode:
-                    if run_count_values["hashRate"] > 0:
-                        avg_hashrate = run_sum_values["hashRate"] / run_count_values["hashRate"]
-                        avg_jth = run_sum_values["jth"] / run_count_values["jth"] if run_count_values["jth"] > 0 else 0
-                        if avg_hashrate > best_hashrate:
-                            best_hashrate = avg_hashrate
-                            best_frequency = frequency
-                            best_voltage = core_voltage
-                        if core_voltage not in best_hashrates or avg_hashrate > best_hashrates[core_voltage][1]:
-                            best_hashrates[core_voltage] = (frequency, avg_hashrate, avg_jth)
+                    # A run cut short by a critical limit is not a candidate for the best hashrate
                     csv_filename = log_data(frequency, core_voltage, run_number,
+                                           note=f"excluded, stopped due to {reason}",
                                            min_values=run_min_values, max_values=run_max_values,
                                            sum_values=run_sum_values, count_values=run_count_values)
                 return csv_filename
@@ -679,34 +1748,645 @@ def run_test(
 
         if not settings_changed:
             display_status(
-                reading_count, total_readings, run_number, total_tests, start_time,
+                reading_count, total_readings, run_number, total_tests,
                 monitor_mode=monitor_mode, min_values=run_min_values, max_values=run_max_values,
-                sum_values=run_sum_values, count_values=run_count_values,
-                start_voltage=start_voltage, stop_voltage=stop_voltage,
-                freq_range=freq_range, freq_step=freq_step, core_voltage=core_voltage,
-                current_voltage_index=voltage_index, total_voltages=total_voltages
+                sum_values=run_sum_values, count_values=run_count_values
             )
 
         time.sleep(CONFIG["status_interval"])
 
     if not monitor_mode and run_count_values["hashRate"] > 0:
-        avg_hashrate = run_sum_values["hashRate"] / run_count_values["hashRate"]
-        avg_jth = run_sum_values["jth"] / run_count_values["jth"] if run_count_values["jth"] > 0 else 0
-        if avg_hashrate > best_hashrate:
-            best_hashrate = avg_hashrate
-            best_frequency = frequency
-            best_voltage = core_voltage
-        if core_voltage not in best_hashrates or avg_hashrate > best_hashrates[core_voltage][1]:
-            best_hashrates[core_voltage] = (frequency, avg_hashrate, avg_jth)
+        record_run_result(frequency, core_voltage, run_sum_values, run_count_values, run_baseline)
         csv_filename = log_data(frequency, core_voltage, run_number,
                                min_values=run_min_values, max_values=run_max_values,
                                sum_values=run_sum_values, count_values=run_count_values)
         return csv_filename
     return readings_filename
 
+FAST_COMMANDS = ("status", "set", "reboot", "validate-values", "journal", "fleet", "dashboard", "discover")
+
+# Dashboard columns as (heading, width, alignment). Widths are fixed so every cell has a known
+# screen position and can be rewritten on its own.
+DASHBOARD_COLUMNS = (
+    ("Device", 18, "<"), ("Freq", 7, ">"), ("mV", 7, ">"), ("GH/s", 10, ">"), ("J/TH", 8, ">"),
+    ("Temp", 8, ">"), ("VR", 8, ">"), ("Power", 8, ">"), ("Run", 9, ">"), ("ETA", 9, ">"), ("Age", 7, ">"),
+)
+DASHBOARD_SORT_KEYS = {
+    "device": lambda state: state["device"],
+    "hashrate": lambda state: (-state["hashRate"], state["device"]),
+    "jth": lambda state: (state["jth"] or float('inf'), state["device"]),
+    "temp": lambda state: (-state["temp"], state["device"]),
+}
+
+def api_request(base_url, method, path, payload=None, timeout=10):
+    import http.client
+    connection = http.client.HTTPConnection(base_url.split("://", 1)[-1], timeout=timeout)
+    try:
+        body = json.dumps(payload) if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        data = response.read()
+        if response.status >= 400:
+            raise OSError(f"{response.status} {response.reason} for {method} {path}")
+        return json.loads(data) if data else {}
+    except (http.client.HTTPException, ValueError) as e:
+        raise OSError(f"Invalid response for {method} {path}: {e}") from e
+    finally:
+        connection.close()
+
+def decode_chunked(body):
+    decoded = b""
+    while body:
+        size_line, _, body = body.partition(b"\r\n")
+        size = int(size_line.split(b";")[0], 16)
+        if size == 0:
+            break
+        decoded += body[:size]
+        body = body[size + 2:]
+    return decoded
+
+async def fetch_device_info(host, semaphore, timeout):
+    import asyncio
+    async with semaphore:
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, 80), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        try:
+            writer.write(f"GET /api/system/info HTTP/1.0\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+            await writer.drain()
+            response = b""
+            while len(response) < 65536:
+                chunk = await asyncio.wait_for(reader.read(65536), timeout)
+                if not chunk:
+                    break
+                response += chunk
+        except (OSError, asyncio.TimeoutError):
+            return None
+        finally:
+            writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    status_line, _, headers = head.partition(b"\r\n")
+    if status_line.split(b" ")[1:2] != [b"200"]:
+        return None
+    try:
+        if b"transfer-encoding: chunked" in headers.lower():
+            body = decode_chunked(body)
+        info = json.loads(body)
+    except ValueError:
+        return None
+    if not isinstance(info, dict) or "hashRate" not in info or "coreVoltage" not in info:
+        return None
+    return info
+
+def scan_hosts(hosts, concurrency=None, timeout=None):
+    import asyncio
+    concurrency = concurrency or CONFIG["discover_concurrency"]
+    timeout = timeout or CONFIG["discover_timeout"]
+
+    async def scan():
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(fetch_device_info(host, semaphore, timeout) for host in hosts))
+
+    return {host: info for host, info in zip(hosts, asyncio.run(scan())) if info is not None}
+
+def read_inventory(filename):
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            inventory = json.load(f)
+    except FileNotFoundError:
+        return {"scans": {}, "devices": {}}
+    except ValueError as e:
+        raise ValueError(f"Inventory file {filename} is not valid JSON: {e}")
+    if not isinstance(inventory.get("scans"), dict) or not isinstance(inventory.get("devices"), dict):
+        raise ValueError(f"Inventory file {filename} needs 'scans' and 'devices' objects")
+    return inventory
+
+def write_inventory(filename, inventory):
+    with open(f"{filename}.tmp", "w", encoding="utf-8") as f:
+        json.dump(inventory, f, indent=2, sort_keys=True)
+    os.replace(f"{filename}.tmp", filename)
+
+def inventory_record(info, now):
+    return {
+        "hostname": info.get("hostname"),
+        "model": info.get("ASICModel"),
+        "board": info.get("boardVersion"),
+        "firmware": info.get("version"),
+        "frequency": info.get("frequency"),
+        "coreVoltage": info.get("coreVoltage"),
+        "seen": now,
+    }
+
+def discover_devices(network, inventory_file, concurrency=None, timeout=None, force=False):
+    # A network scanned within inventory_ttl is answered from the inventory unless force is set.
+    # Returns ({ip: record} for the network, whether the result came from the inventory).
+    inventory = read_inventory(inventory_file)
+    now = time.time()
+
+    def in_network(ip):
+        return ipaddress.ip_address(ip) in network
+
+    scanned = inventory["scans"].get(str(network))
+    if not force and scanned is not None and now - scanned < CONFIG["inventory_ttl"]:
+        return {ip: record for ip, record in inventory["devices"].items() if in_network(ip)}, True
+
+    found = scan_hosts([str(host) for host in network.hosts()], concurrency, timeout)
+    # Devices in this network that no longer answer are dropped; other networks are kept
+    inventory["devices"] = {ip: record for ip, record in inventory["devices"].items() if not in_network(ip)}
+    inventory["devices"].update({ip: inventory_record(info, now) for ip, info in found.items()})
+    inventory["scans"][str(network)] = now
+    write_inventory(inventory_file, inventory)
+    return {ip: inventory["devices"][ip] for ip in found}, False
+
+def inventory_hosts(filename, model=None):
+    inventory = read_inventory(filename)
+    if not inventory["scans"]:
+        raise FileNotFoundError(f"No devices in {filename}. Run the discover subcommand first.")
+    last_scan = max(inventory["scans"].values())
+    if time.time() - last_scan > CONFIG["inventory_ttl"]:
+        print(ORANGE + f"Inventory {filename} was last scanned {format_duration(time.time() - last_scan)} ago; "
+                       f"run discover again to refresh it." + RESET)
+    ips = [ip for ip, record in inventory["devices"].items() if model is None or record.get("model") == model]
+    return sorted(ips, key=lambda ip: tuple(int(part) for part in ip.split(".")))
+
+def print_inventory(devices):
+    print(f"{'Device':<18}{'Hostname':<16}{'Model':<9}{'Firmware':<14}{'Freq':>7}{'Voltage':>9}")
+    for ip in sorted(devices, key=lambda ip: tuple(int(part) for part in ip.split("."))):
+        record = devices[ip]
+        print(f"{ip:<18}{str(record.get('hostname') or '-'):<16}{str(record.get('model') or '-'):<9}"
+              f"{str(record.get('firmware') or '-'):<14}{record.get('frequency') or 0:>7}{record.get('coreVoltage') or 0:>9}")
+
+def format_status_line(ip, data):
+    hashrate = data.get("hashRate", 0)
+    jth = data.get("power", 0) / (hashrate / 1000) if hashrate > 0 else 0
+    return (f"{ip} {data.get('frequency', 0)} MHz {data.get('coreVoltage', 0)} mV "
+            f"Hashrate {hashrate:.2f} GH/s J/TH {jth:.2f} Temp {data.get('temp', 0):.2f}°C "
+            f"VR Temp {data.get('vrTemp', 0):.2f}°C Power {data.get('power', 0):.2f} W")
+
+def run_inventory_command(args):
+    failed = False
+    if args.command == "status":
+        results = scan_hosts(args.hosts)
+        if args.json:
+            print(json.dumps(results, indent=2))
+        for ip in args.hosts:
+            if ip not in results:
+                print(RED + f"{ip} did not respond" + RESET)
+                failed = True
+            elif not args.json:
+                print(format_status_line(ip, results[ip]))
+        return 1 if failed else 0
+
+    applied = []
+    for ip in args.hosts:
+        try:
+            if args.command == "set":
+                api_request(validate_ip(ip), "PATCH", "/api/system", {"frequency": args.frequency, "coreVoltage": args.voltage})
+                print(GREEN + f"{ip}: set frequency to {args.frequency} MHz, core voltage to {args.voltage} mV" + RESET)
+            else:
+                api_request(validate_ip(ip), "POST", "/api/system/restart")
+                print(GREEN + f"{ip}: rebooted" + RESET)
+            applied.append(ip)
+        except OSError as e:
+            print(RED + f"Error running {args.command} on {ip}: {e}" + RESET)
+            failed = True
+    if args.command == "set" and not args.no_verify and applied:
+        # One settling delay for the whole inventory rather than one per device
+        time.sleep(5)
+        results = scan_hosts(applied)
+        for ip in applied:
+            data = results.get(ip)
+            if data is None or abs(data.get("frequency", 0) - args.frequency) > 1 or abs(data.get("coreVoltage", 0) - args.voltage) > 1:
+                actual = f"{data.get('frequency', 0)} MHz, {data.get('coreVoltage', 0)} mV" if data else "no response"
+                print(RED + f"{ip}: settings did not apply correctly. Actual: {actual}" + RESET)
+                failed = True
+    return 1 if failed else 0
+
+def dashboard_cell(text, width, align="<", color=None):
+    text = str(text)[:width - 1]
+    return (f"{text:<{width - 1}} " if align == "<" else f" {text:>{width - 1}}"), color
+
+def dashboard_row(state, now):
+    age = now - state["ts"]
+    stale = age > CONFIG["fleet_stale_after"]
+    published_limits = state.get("limits") if isinstance(state.get("limits"), dict) else {}
+    limits = {key: published_limits.get(key, CONFIG[key]) for key in FLEET_LIMIT_KEYS}
+    temp_color = RED if state["temp"] >= limits["max_temp_critical"] else ORANGE if state["temp"] >= limits["max_temp_warning"] else None
+    vrtemp_color = RED if state["vrTemp"] >= limits["max_vrtemp_critical"] else ORANGE if state["vrTemp"] >= limits["max_vrtemp_warning"] else None
+    power_color = RED if state["power"] >= limits["max_power_critical"] else ORANGE if state["power"] >= limits["max_power_warning"] else None
+    if state.get("total_tests"):
+        run = f"{state['run']}/{state['total_tests']}"
+        eta = format_duration(max(0, state["sweep_end"] - now))
+    else:
+        run = "monitor" if state.get("run") else "-"
+        eta = "-"
+    values = (
+        (state["device"], RED if stale else None), (state["frequency"], None), (state["coreVoltage"], None),
+        (f"{state['hashRate']:.2f}", None), (f"{state['jth']:.2f}", None), (f"{state['temp']:.1f}", temp_color),
+        (f"{state['vrTemp']:.1f}", vrtemp_color), (f"{state['power']:.2f}", power_color), (run, None), (eta, None),
+        (f"{int(age)}s", RED if stale else None),
+    )
+    return [dashboard_cell(value, width, align, color) for (value, color), (_, width, align) in zip(values, DASHBOARD_COLUMNS)]
+
+def scan_fleet_dir(directory, cache):
+    # Only files whose mtime changed since the last scan are re-read; cache maps names to (mtime, state).
+    seen = set()
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            seen.add(entry.name)
+            try:
+                mtime = entry.stat().st_mtime
+                if entry.name in cache and cache[entry.name][0] == mtime:
+                    continue
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                # Files that are not device states are cached as None so they are not re-read every frame
+                cache[entry.name] = (mtime, state if is_fleet_state(state) else None)
+            except (OSError, ValueError):
+                continue  # Being replaced or removed by its owner; keep the last good state
+    for name in list(cache):
+        if name not in seen:
+            del cache[name]
+    return [state for _, state in cache.values() if state is not None]
+
+def dashboard_frame(states, sort_key, now, max_rows=None):
+    rows = [[dashboard_cell(heading, width, align) for heading, width, align in DASHBOARD_COLUMNS]]
+    states = sorted(states, key=DASHBOARD_SORT_KEYS[sort_key])
+    shown = states if max_rows is None else states[:max(1, max_rows - 2)]
+    rows.extend(dashboard_row(state, now) for state in shown)
+    total_width = sum(width for _, width, _ in DASHBOARD_COLUMNS)
+    live = [state for state in states if now - state["ts"] <= CONFIG["fleet_stale_after"]]
+    footer = (f"{len(live)}/{len(states)} devices live, {sum(state['hashRate'] for state in live):.2f} GH/s, "
+              f"{sum(state['power'] for state in live):.2f} W, sorted by {sort_key}")
+    if len(shown) < len(states):
+        footer += f", {len(states) - len(shown)} not shown"
+    rows.append([dashboard_cell(f"[{datetime.fromtimestamp(now).strftime('%H:%M:%S')}] {footer}", total_width, "<", GREEN)])
+    return rows
+
+def dashboard_updates(rows, previous):
+    # Moves the cursor to each cell that differs from the previous frame; unchanged cells are left alone.
+    updates = []
+    for row_number, row in enumerate(rows, 1):
+        old_row = previous[row_number - 1] if row_number <= len(previous) else None
+        column = 1
+        for cell_number, (text, color) in enumerate(row):
+            if old_row is None or len(old_row) != len(row) or old_row[cell_number] != (text, color):
+                updates.append(f"\033[{row_number};{column}H" + (color + text + RESET if color else text))
+            column += len(text)
+        if old_row is not None and len(old_row) != len(row):
+            updates.append("\033[K")
+    for row_number in range(len(rows) + 1, len(previous) + 1):
+        updates.append(f"\033[{row_number};1H\033[K")
+    return "".join(updates)
+
+def run_dashboard(directory, sort_key, refresh, once=False):
+    cache = {}
+    if once or not sys.stdout.isatty():
+        for row in dashboard_frame(scan_fleet_dir(directory, cache), sort_key, time.time()):
+            print("".join(color + text + RESET if color else text for text, color in row).rstrip())
+        return 0
+    previous = []
+    terminal_size = None
+    sys.stdout.write("\033[?25l")
+    try:
+        while True:
+            frame_start = time.time()
+            size = shutil.get_terminal_size()
+            if size != terminal_size:
+                # Cell positions are only valid for the size they were drawn at
+                sys.stdout.write("\033[2J")
+                previous = []
+                terminal_size = size
+            rows = dashboard_frame(scan_fleet_dir(directory, cache), sort_key, frame_start, size.lines - 1)
+            sys.stdout.write(dashboard_updates(rows, previous))
+            sys.stdout.flush()
+            previous = rows
+            time.sleep(max(0, refresh - (time.time() - frame_start)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sys.stdout.write(f"\033[{len(previous) + 1};1H\033[?25h\n")
+        sys.stdout.flush()
+    return 0
+
+def parse_fast_command(argv):
+    parser = argparse.ArgumentParser(
+        prog="bitaxe_status_logger.py",
+        description="One-shot Bitaxe commands that skip the logger setup and use a minimal stdlib HTTP client."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    status_parser = subparsers.add_parser("status", help="Print the current frequency, voltage, hashrate, temperatures and power")
+    status_parser.add_argument("-json", action="store_true", help="Print the raw /api/system/info response as JSON")
+    set_parser = subparsers.add_parser("set", help="Set frequency and core voltage")
+    set_parser.add_argument("-v", "--voltage", type=int, required=True, help=f"Core voltage in mV (minimum {CONFIG['min_core_voltage']} mV)")
+    set_parser.add_argument("-f", "--frequency", type=int, required=True, help=f"Frequency in MHz (minimum {CONFIG['min_frequency']} MHz)")
+    set_parser.add_argument("-no-verify", dest="no_verify", action="store_true", help="Do not wait 5s and read the settings back")
+    reboot_parser = subparsers.add_parser("reboot", help="Restart the Bitaxe")
+    for device_parser in (status_parser, set_parser, reboot_parser):
+        target = device_parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("-ip", "--ip_address", type=str, help="Bitaxe IP address (e.g., 192.168.2.205)")
+        target.add_argument("-inventory", type=str, help="Run on every device in an inventory file written by discover")
+        device_parser.add_argument("-model", type=str, help="With -inventory, only devices with this ASIC model (e.g., BM1370)")
+    validate_parser = subparsers.add_parser("validate-values", help="Check values CSV files without contacting a Bitaxe")
+    validate_parser.add_argument("files", nargs="*", help="Values CSV files to validate")
+    validate_parser.add_argument("-profiles", type=str, help="Profiles CSV file to validate, including every values file it references")
+    validate_parser.add_argument("-config", type=str, help="Config file (JSON or TOML) to validate")
+    journal_parser = subparsers.add_parser("journal", help="Summarise an event journal written with -journal")
+    journal_parser.add_argument("file", help="Event journal (JSON lines) to read")
+    journal_parser.add_argument("-ip", "--ip_address", type=str, help="Only include events for this Bitaxe IP address")
+    fleet_parser = subparsers.add_parser("fleet", help="Show the devices publishing to a fleet directory and their total power")
+    fleet_parser.add_argument("fleet_dir", help="Fleet directory passed to -fleet-dir")
+    fleet_parser.add_argument("-power-budget", dest="power_budget", type=float, help="Power budget in W to compare the total against")
+    dashboard_parser = subparsers.add_parser("dashboard", help="Live one-row-per-device view of the devices publishing to a fleet directory")
+    dashboard_parser.add_argument("fleet_dir", help="Fleet directory passed to -fleet-dir")
+    dashboard_parser.add_argument("-sort", choices=sorted(DASHBOARD_SORT_KEYS), default="device",
+                                  help="Row order: device, hashrate (highest first), jth (most efficient first) or temp (hottest first) (default: device)")
+    dashboard_parser.add_argument("-refresh", type=float, default=CONFIG["dashboard_refresh"],
+                                  help=f"Minimum seconds between redraws (default: {CONFIG['dashboard_refresh']})")
+    dashboard_parser.add_argument("-once", action="store_true", help="Print a single frame without cursor control and exit")
+    discover_parser = subparsers.add_parser("discover", help="Scan a network for Bitaxes and record them in an inventory file")
+    discover_parser.add_argument("network", help="Network to scan in CIDR notation (e.g., 192.168.2.0/24)")
+    discover_parser.add_argument("-inventory", type=str, default="inventory.json", help="Inventory file to update (default: inventory.json)")
+    discover_parser.add_argument("-concurrency", type=int, default=CONFIG["discover_concurrency"],
+                                 help=f"Maximum simultaneous connections (default: {CONFIG['discover_concurrency']})")
+    discover_parser.add_argument("-timeout", type=float, default=CONFIG["discover_timeout"],
+                                 help=f"Seconds to wait for each address (default: {CONFIG['discover_timeout']})")
+    discover_parser.add_argument("-force", action="store_true",
+                                 help=f"Scan even if the inventory has results for this network younger than {CONFIG['inventory_ttl']}s")
+    discover_parser.add_argument("-list", action="store_true", help="Print only the IP addresses found, one per line")
+    args = parser.parse_args(argv)
+    if args.command == "set":
+        if args.voltage < CONFIG["min_core_voltage"]:
+            parser.error(f"Voltage must be at least {CONFIG['min_core_voltage']} mV")
+        if args.frequency < CONFIG["min_frequency"]:
+            parser.error(f"Frequency must be at least {CONFIG['min_frequency']} MHz")
+    if args.command in ("status", "set", "reboot"):
+        if args.model and not args.inventory:
+            parser.error("-model requires -inventory")
+        if args.inventory:
+            try:
+                args.hosts = inventory_hosts(args.inventory, args.model)
+            except (FileNotFoundError, ValueError) as e:
+                parser.error(str(e))
+            if not args.hosts:
+                parser.error(f"No matching devices in {args.inventory}")
+    if args.command == "validate-values":
+        if not args.files and not args.profiles and not args.config:
+            parser.error("validate-values needs at least one values file, -profiles or -config")
+    elif args.command == "dashboard":
+        if args.refresh <= 0:
+            parser.error("Refresh interval must be positive")
+        if not os.path.isdir(args.fleet_dir):
+            parser.error(f"Fleet directory '{args.fleet_dir}' does not exist")
+    elif args.command == "discover":
+        try:
+            args.network = ipaddress.IPv4Network(args.network, strict=False)
+        except ValueError as e:
+            parser.error(f"Invalid network: {e}")
+        if args.network.num_addresses > 65536:
+            parser.error("Networks larger than /16 are not scanned")
+        if args.concurrency <= 0:
+            parser.error("Concurrency must be positive")
+        if args.timeout <= 0:
+            parser.error("Timeout must be positive")
+    elif args.command not in ("journal", "fleet") and not args.inventory:
+        try:
+            args.base_url = validate_ip(args.ip_address)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+def print_journal_report(events):
+    event_counts = {}
+    for record in events:
+        event_counts[record["event"]] = event_counts.get(record["event"], 0) + 1
+    print(GREEN + f"{len(events)} events from {events[0]['time']} to {events[-1]['time']}" + RESET)
+    print("Events: " + ", ".join(f"{event} {count}" for event, count in sorted(event_counts.items())))
+
+    apply_times = [record["apply_seconds"] for record in events if record["event"] == "settings" and record.get("ok")]
+    failed_settings = sum(1 for record in events if record["event"] == "settings" and not record.get("ok"))
+    if apply_times:
+        print(f"Settings applied: {len(apply_times)} (failed: {failed_settings}), "
+              f"time to verified apply avg {sum(apply_times) / len(apply_times):.2f}s, max {max(apply_times):.2f}s")
+
+    daily_fallbacks = fallbacks_per_day(events)
+    if daily_fallbacks:
+        print("Fallbacks per day:")
+        for day, count in sorted(daily_fallbacks.items()):
+            print(f"  {day}: {count}")
+
+    mtbf = reboot_mtbf(events)
+    for device, seconds in sorted(mtbf.items()):
+        print(f"Reboot MTBF for {device}: {seconds / 3600:.2f}h")
+
+    losses = fallback_losses(events)
+    if losses:
+        recovered = [seconds for _, _, seconds, _ in losses if seconds is not None]
+        lost_rates = [lost for _, _, _, lost in losses if lost is not None]
+        print(f"Fallbacks: {len(losses)}, recovered to the previous voltage: {len(recovered)}")
+        if recovered:
+            print(f"  Time below the fallback voltage: avg {sum(recovered) / len(recovered) / 60:.1f} min, "
+                  f"total {sum(recovered) / 3600:.2f}h (advance_delay lockout included)")
+        if lost_rates:
+            print(f"  Hashrate drop after fallback: avg {sum(lost_rates) / len(lost_rates):.2f} GH/s")
+        estimated = [lost * seconds / 3600 for _, _, seconds, lost in losses if seconds is not None and lost is not None]
+        if estimated:
+            print(f"  Estimated hashrate lost to recovered fallbacks: {sum(estimated):.2f} GH/s·h")
+
+def print_fleet_report(directory, budget=None):
+    states = sorted(read_fleet_states(directory), key=lambda state: state["device"])
+    if not states:
+        print(ORANGE + f"No devices have published to {directory} in the last {CONFIG['fleet_stale_after']}s." + RESET)
+        return
+    print(f"{'Device':<18}{'Freq':>7}{'Voltage':>9}{'Hashrate':>11}{'Power':>9}{'GH/s/W':>9}{'Request':>10}")
+    for state in states:
+        request = (f"+{state['advance_watts']:.1f}W" if state.get("advance_watts") is not None else "")
+        print(f"{state['device']:<18}{state['frequency']:>7}{state['coreVoltage']:>9}{state['hashRate']:>11.2f}"
+              f"{fleet_power(state):>9.2f}{fleet_efficiency(state):>9.2f}{request:>10}")
+    total_power = sum(fleet_power(state) for state in states)
+    total_hashrate = sum(state["hashRate"] for state in states)
+    line = f"Total: {len(states)} devices, {total_hashrate:.2f} GH/s, {total_power:.2f} W"
+    if budget is not None:
+        color = RED if total_power > budget else GREEN
+        line = color + line + f" of {budget:.2f} W budget" + RESET
+    print(line)
+
+def run_fast_command(argv):
+    args = parse_fast_command(argv)
+    if args.command == "discover":
+        try:
+            devices, cached = discover_devices(args.network, args.inventory, args.concurrency, args.timeout, args.force)
+        except (OSError, ValueError) as e:
+            print(RED + f"Error updating inventory {args.inventory}: {e}" + RESET)
+            return 1
+        if args.list:
+            for ip in sorted(devices, key=lambda ip: tuple(int(part) for part in ip.split("."))):
+                print(ip)
+            return 0
+        source = f"from {args.inventory} (scanned less than {CONFIG['inventory_ttl']}s ago, -force to rescan)" if cached else f"in {args.network}"
+        print(GREEN + f"Found {len(devices)} devices {source}" + RESET)
+        if devices:
+            print_inventory(devices)
+        return 0
+    if getattr(args, "inventory", None):
+        return run_inventory_command(args)
+    if args.command == "dashboard":
+        return run_dashboard(args.fleet_dir, args.sort, args.refresh, args.once)
+    if args.command == "fleet":
+        print_fleet_report(args.fleet_dir, args.power_budget)
+        return 0
+    if args.command == "journal":
+        try:
+            events = read_journal(args.file, args.ip_address)
+        except FileNotFoundError as e:
+            print(RED + str(e) + RESET)
+            return 1
+        if not events:
+            print(ORANGE + "No matching events in the journal." + RESET)
+            return 0
+        print_journal_report(events)
+        return 0
+    if args.command == "validate-values":
+        failed = False
+        files = list(args.files)
+        if args.config:
+            try:
+                compiled_config = load_config_file(args.config)
+                print(GREEN + f"Config file {args.config} is valid: {len(compiled_config['models'])} models, "
+                              f"{len(compiled_config['devices'])} devices" + RESET)
+            except (FileNotFoundError, ValueError) as e:
+                print(RED + f"{args.config}: {e}" + RESET)
+                failed = True
+        if args.profiles:
+            try:
+                read_profiles_csv(args.profiles)
+                files.extend(values_file for _, values_file in profiles)
+            except (FileNotFoundError, ValueError) as e:
+                print(RED + f"{args.profiles}: {e}" + RESET)
+                failed = True
+        for filename in files:
+            try:
+                read_values_csv(filename)
+            except (FileNotFoundError, ValueError) as e:
+                print(RED + f"{filename}: {e}" + RESET)
+                failed = True
+        return 1 if failed else 0
+
+    try:
+        if args.command == "status":
+            data = api_request(args.base_url, "GET", "/api/system/info")
+            if args.json:
+                print(json.dumps(data, indent=2))
+            else:
+                print(format_status_line(args.ip_address, data))
+        elif args.command == "set":
+            api_request(args.base_url, "PATCH", "/api/system",
+                        {"frequency": args.frequency, "coreVoltage": args.voltage})
+            print(GREEN + f"Set frequency to {args.frequency} MHz, core voltage to {args.voltage} mV" + RESET)
+            if not args.no_verify:
+                time.sleep(5)
+                data = api_request(args.base_url, "GET", "/api/system/info")
+                actual_freq = data.get("frequency", 0)
+                actual_volt = data.get("coreVoltage", 0)
+                if abs(actual_freq - args.frequency) > 1 or abs(actual_volt - args.voltage) > 1:
+                    print(RED + f"Error: Settings did not apply correctly. Requested: {args.frequency} MHz, {args.voltage} mV; "
+                                f"Actual: {actual_freq} MHz, {actual_volt} mV" + RESET)
+                    return 1
+                print(GREEN + f"Verified settings: Actual frequency {actual_freq} MHz, actual core voltage {actual_volt} mV" + RESET)
+        elif args.command == "reboot":
+            api_request(args.base_url, "POST", "/api/system/restart")
+            print(GREEN + "Bitaxe rebooted successfully." + RESET)
+    except OSError as e:
+        print(RED + f"Error running {args.command} on {args.ip_address}: {e}" + RESET)
+        return 1
+    return 0
+
+def build_sweep_schedule(centers, freq_range, freq_step, order="ascending", retests=0, seed=None):
+    # centers holds (voltage, center frequency) pairs; each voltage runs center ± freq_range in freq_step steps.
+    grid = [[(volt, freq) for freq in range(center - freq_range, center + freq_range + 1, freq_step)]
+            for volt, center in centers]
+    if order == "serpentine":
+        # Alternate the frequency direction per voltage so consecutive runs stay thermally close
+        points = [point for i, row in enumerate(grid) for point in (row if i % 2 == 0 else row[::-1])]
+    elif order == "cooldown":
+        # Coolest first by estimated power (frequency x voltage squared), so the chip only warms up between runs
+        points = sorted((point for row in grid for point in row), key=lambda point: (point[1] * point[0] ** 2, point))
+    else:
+        points = [point for row in grid for point in row]
+
+    if order == "random":
+        schedule = points * (retests + 1)
+        random.Random(seed).shuffle(schedule)
+        return schedule
+    schedule = []
+    for i in range(retests + 1):
+        # Re-test passes walk back the other way, so warm-up and cool-down bias average out
+        schedule.extend(points if i % 2 == 0 else points[::-1])
+    return schedule
+
+def run_sweep(centers, freq_range, freq_step, reboot_threshold, order, retests, seed, csv_files,
+              values_file=None, update_values=False, log_found=False):
+    global critical_temp_reached
+    schedule = build_sweep_schedule(centers, freq_range, freq_step, order, retests, seed)
+    center_frequencies = dict(centers)
+    runs_left = {}
+    last_run = {}
+    for run_number, (volt, _) in enumerate(schedule, 1):
+        runs_left[volt] = runs_left.get(volt, 0) + 1
+        last_run[volt] = run_number
+    critical_points = []
+    cooldown_needed = False
+    skipped = 0
+    previous_voltage = None
+    for run_number, (volt, freq) in enumerate(schedule, 1):
+        if any(volt >= critical_volt and freq >= critical_freq for critical_volt, critical_freq in critical_points):
+            skipped += 1
+        else:
+            if cooldown_needed:
+                cooldown_needed = False
+                wait_for_cooldown()
+                if is_interrupted:
+                    break
+            if volt != previous_voltage:
+                print(GREEN + f"Testing voltage {volt} mV with center frequency {center_frequencies[volt]} MHz ± {freq_range} MHz" + RESET)
+                previous_voltage = volt
+            csv_file = run_test(
+                freq, volt, run_number, reboot_threshold, len(schedule),
+                # Runs of one voltage are not consecutive in every order, so its time remaining
+                # runs to its last position in the schedule, including other voltages' runs in between
+                voltage_runs_remaining=last_run[volt] - run_number + 1
+            )
+            if csv_file and csv_file not in csv_files:
+                csv_files.append(csv_file)
+            if is_interrupted:
+                break
+            if critical_temp_reached:
+                critical_temp_reached = False
+                cooldown_needed = True
+                critical_points.append((volt, freq))
+                print(ORANGE + f"Skipping remaining runs at {freq} MHz or higher with {volt} mV or higher; "
+                               f"continuing with lower frequencies." + RESET)
+        runs_left[volt] -= 1
+        if runs_left[volt] == 0 and log_found and volt in best_hashrates:
+            center = center_frequencies[volt]
+            best_freq, best_hash, avg_jth, baseline_temp, baseline_vrtemp = best_hashrates[volt]
+            log_values_found(volt, best_freq, best_hash, center - freq_range, center + freq_range, avg_jth,
+                             baseline_temp, baseline_vrtemp)
+            if update_values:
+                update_values_csv(values_file, volt, best_freq)
+    if skipped:
+        print(ORANGE + f"Skipped {skipped} of {len(schedule)} runs after critical limits were reached." + RESET)
+
 def main():
     global initial_frequency, initial_core_voltage, bitaxe_ip, best_frequency, best_voltage, critical_temp_reached
-    global readings_filename, summaries_filename, values_found_filename, best_hashrates
+    global readings_filename, summaries_filename, values_found_filename, best_hashrates, thermal_baseline, journal_filename
+    global fleet_dir, power_budget, budget_policy, compact_status
+    if len(sys.argv) > 1 and sys.argv[1] in FAST_COMMANDS:
+        sys.exit(run_fast_command(sys.argv[1:]))
     (
         voltage,
         start_voltage,
@@ -717,8 +2397,29 @@ def main():
         freq_step,
         reboot_threshold,
         monitor_mode,
-        values_file
+        values_file,
+        update_values,
+        explore_range,
+        profiles_file,
+        journal_filename,
+        fleet_dir,
+        power_budget,
+        budget_policy,
+        sweep_order,
+        retests,
+        seed,
+        compact_status
     ) = parse_arguments()
+    signal.signal(signal.SIGINT, signal_handler)
+
+    if profiles_file:
+        if not fetch_thermal_baseline():
+            thermal_baseline = {"temp": float('inf'), "vrTemp": float('inf')}
+            print(ORANGE + "Starting with the hottest profile until a thermal baseline is available." + RESET)
+        if not select_profile_for_baseline():
+            print(RED + "No ladder could be loaded from the profiles. Exiting." + RESET)
+            sys.exit(1)
+        values_file = values_filename
 
     initial_core_voltage = voltage
     if values_file and monitor_mode:
@@ -741,11 +2442,6 @@ def main():
         freq_range = 0
         freq_step = 1
         total_tests = 1
-    else:
-        if start_voltage is not None and stop_voltage is not None:
-            total_tests = 1
-        else:
-            total_tests = ((initial_frequency + freq_range) - (initial_frequency - freq_range)) // freq_step + 1
 
     print(GREEN + f"Initial settings: IP: {bitaxe_ip}" + RESET)
     csv_files = [readings_filename]
@@ -756,67 +2452,41 @@ def main():
             print(GREEN + f"Testing voltages from {start_voltage} mV to {stop_voltage} mV, sweeping frequency for each voltage" + RESET)
         else:
             print(GREEN + f"Testing from {initial_frequency - freq_range} MHz to {initial_frequency + freq_range} MHz with step {freq_step} MHz at {voltage} mV" + RESET)
+        print(GREEN + f"Run order: {sweep_order}" + (f" with {retests} re-test passes" if retests else "") + RESET)
     else:
         print(GREEN + f"Monitoring at {initial_frequency} MHz, {initial_core_voltage} mV indefinitely" + RESET)
-        if values_file:
+        if profiles_file:
+            print(GREEN + f"Using ambient profiles from {profiles_file} for dynamic adjustments" + RESET)
+        elif values_file:
             print(GREEN + f"Using values from {values_file} for dynamic adjustments" + RESET)
+        if power_budget is not None:
+            print(GREEN + f"Sharing a {power_budget} W power budget ({budget_policy}) with the devices in {fleet_dir}" + RESET)
+        if explore_range:
+            print(GREEN + f"Exploring ±{explore_range} MHz around the ladder frequency every {CONFIG['explore_interval']}s" + RESET)
 
     if monitor_mode:
         csv_file = run_test(
             initial_frequency, initial_core_voltage, 1, reboot_threshold, total_tests,
-            monitor_mode=True, values_file=values_file
+            monitor_mode=True, values_file=values_file,
+            explore_range=explore_range, update_values=update_values
         )
         if csv_file and csv_file not in csv_files:
             csv_files.append(csv_file)
     elif start_voltage is not None and stop_voltage is not None:
-        total_voltages = stop_voltage - start_voltage + 1
-        for voltage_index, volt in enumerate(range(start_voltage, stop_voltage + 1), 1):
-            center_freq = get_frequency_for_voltage(volt, values_file)
-            print(GREEN + f"Testing voltage {volt} mV with center frequency {center_freq} MHz ± {freq_range} MHz" + RESET)
-            freq_tests = ((center_freq + freq_range) - (center_freq - freq_range)) // freq_step + 1
-            min_freq_tested = center_freq - freq_range
-            max_freq_tested = center_freq + freq_range
-            run_number = 1
-            for freq in range(min_freq_tested, max_freq_tested + 1, freq_step):
-                start_time = time.time()
-                csv_file = run_test(
-                    freq, volt, run_number, reboot_threshold, freq_tests,
-                    start_voltage=start_voltage, stop_voltage=stop_voltage,
-                    freq_range=freq_range, freq_step=freq_step,
-                    voltage_index=voltage_index, total_voltages=total_voltages
-                )
-                if csv_file and csv_file not in csv_files:
-                    csv_files.append(csv_file)
-                run_number += 1
-                if is_interrupted or critical_temp_reached:
-                    break
-            if is_interrupted or critical_temp_reached:
-                break
-            if volt in best_hashrates:
-                best_freq, best_hash, avg_jth = best_hashrates[volt]
-                log_values_found(volt, best_freq, best_hash, min_freq_tested, max_freq_tested, avg_jth)
-            critical_temp_reached = False
+        centers = [(volt, get_frequency_for_voltage(volt, values_file)) for volt in range(start_voltage, stop_voltage + 1)]
+        run_sweep(centers, freq_range, freq_step, reboot_threshold, sweep_order, retests, seed, csv_files,
+                  values_file=values_file, update_values=update_values, log_found=True)
         if best_hashrate > 0 and best_frequency is not None and best_voltage is not None:
             print(GREEN + f"Setting system to best hashrate settings: {best_frequency} MHz, {best_voltage} mV" + RESET)
-            if not set_system_settings(best_frequency, best_voltage):
+            if not set_system_settings(best_frequency, best_voltage, reason="best hashrate"):
                 print(RED + f"Failed to set best hashrate settings. Reverting to initial settings." + RESET)
-                set_system_settings(initial_frequency, initial_core_voltage)
+                set_system_settings(initial_frequency, initial_core_voltage, reason="revert to initial")
         else:
             print(ORANGE + "No valid runs completed. Reverting to initial settings." + RESET)
-            set_system_settings(initial_frequency, initial_core_voltage)
+            set_system_settings(initial_frequency, initial_core_voltage, reason="revert to initial")
     else:
-        run_number = 1
-        start_time = time.time()
-        for freq in range(initial_frequency - freq_range, initial_frequency + freq_range + 1, freq_step):
-            csv_file = run_test(
-                freq, voltage, run_number, reboot_threshold, total_tests,
-                freq_range=freq_range, freq_step=freq_step
-            )
-            if csv_file and csv_file not in csv_files:
-                csv_files.append(csv_file)
-            run_number += 1
-            if is_interrupted or critical_temp_reached:
-                break
+        run_sweep([(voltage, initial_frequency)], freq_range, freq_step, reboot_threshold, sweep_order, retests, seed,
+                  csv_files)
 
     if not monitor_mode:
         display_summary(csv_files)